@@ -2,14 +2,25 @@
 """
 Flask web application for Executive Assistant
 """
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, render_template, request, jsonify, session, stream_with_context
 from flask_cors import CORS
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from operator import itemgetter
 from zoneinfo import ZoneInfo
+import hashlib
+import heapq
 import json
 import os
-from assistant import ExecutiveAssistant
-import os
+import threading
+from assistant import ExecutiveAssistant, is_priority, format_day_date, format_clock_time
+
+# praw is only needed for the popular-posts fallback when Reddit services aren't configured
+try:
+    import praw
+    HAS_PRAW = True
+except ImportError:
+    HAS_PRAW = False
 
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', os.urandom(24).hex())
@@ -17,21 +28,54 @@ CORS(app)
 
 # Initialize assistant (shared instance)
 assistant = None
+# Guards creation so concurrent cold-start requests don't each run OAuth and client setup
+assistant_lock = threading.Lock()
+
+# Browser cache lifetimes (seconds) for dashboard panel endpoints; 0 means always
+# revalidate (still a cheap 304 when unchanged), for panels the user changes directly
+# (dismissing emails, editing exclusions) that must not be served stale
+CACHEABLE_ENDPOINTS = {
+    '/api/dashboard': 0,
+    '/api/calendar/upcoming': 60,
+    '/api/emails/recent': 0,
+    '/api/reddit': 60,
+    '/api/news': 300
+}
+
+# Read-only Reddit client for the popular-posts fallback (created on first use)
+fallback_reddit = None
 
 def get_assistant():
     """Get or create assistant instance"""
     global assistant
     if assistant is None:
-        try:
-            # Get LLM provider from config (stored default or env var)
-            from llm_config import get_effective_provider
-            llm_provider = get_effective_provider()
-            assistant = ExecutiveAssistant(llm_provider=llm_provider)
-        except Exception as e:
-            print(f"Error initializing assistant: {e}")
-            return None
+        with assistant_lock:
+            if assistant is None:
+                try:
+                    # Get LLM provider from config (stored default or env var)
+                    from llm_config import get_effective_provider
+                    llm_provider = get_effective_provider()
+                    assistant = ExecutiveAssistant(llm_provider=llm_provider)
+                except Exception as e:
+                    print(f"Error initializing assistant: {e}")
+                    return None
     return assistant
 
+@app.after_request
+def add_cache_headers(response):
+    """Let the browser reuse dashboard panels and revalidate them with an ETag"""
+    max_age = CACHEABLE_ENDPOINTS.get(request.path)
+    # Routes that set their own Cache-Control (e.g. a partly failed dashboard) keep it
+    if (max_age is None or request.method != 'GET' or response.status_code != 200
+            or response.direct_passthrough or 'Cache-Control' in response.headers):
+        return response
+    
+    etag = hashlib.blake2b(response.get_data(), digest_size=8).hexdigest()
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = f'private, max-age={max_age}' if max_age else 'private, no-cache'
+    # Turns the response into an empty 304 when If-None-Match matches
+    return response.make_conditional(request)
+
 @app.route('/')
 def index():
     """Home page"""
@@ -56,6 +100,170 @@ def chat():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def fetch_upcoming_calendar(assistant) -> dict:
+    """Build the upcoming calendar panel - exactly 10 events"""
+    events = assistant.google.get_events(
+        days_ahead=60,  # Get more to ensure we have 10
+        fields='items(id,summary,start,location,description,htmlLink)'
+    )
+    
+    # Parse each start time once and keep only upcoming events
+    candidates = []
+    now = datetime.now(assistant.tz)
+    
+    for event in events:
+        start_str = event.get('start', {}).get('dateTime') or event.get('start', {}).get('date')
+        if not start_str:
+            continue
+        
+        try:
+            if 'T' in start_str:
+                start = datetime.fromisoformat(start_str.replace('Z', '+00:00'))
+            else:
+                start = datetime.fromisoformat(start_str)
+                start = start.replace(tzinfo=assistant.tz)
+        except Exception as e:
+            continue
+        
+        if start >= now:
+            candidates.append((start, event))
+    
+    # Take exactly the next 10 by start time, then build display data only for those
+    upcoming_events = []
+    for start, event in heapq.nsmallest(10, candidates, key=itemgetter(0)):
+        upcoming_events.append({
+            'id': event.get('id'),
+            'title': event.get('summary', 'No title'),
+            'start': start.isoformat(),
+            'start_display': f"{format_day_date(start)} at {format_clock_time(start)}",
+            'location': event.get('location', ''),
+            'description': event.get('description', ''),
+            'htmlLink': event.get('htmlLink', ''),
+            'is_priority': is_priority(event.get('summary', ''))
+        })
+    
+    return {'events': upcoming_events}  # Return exactly 10 or less
+
+def fetch_recent_emails(assistant) -> dict:
+    """Build the recent emails panel"""
+    # Get emails since last login or last 24 hours
+    since_date = getattr(assistant, 'previous_login', None)
+    if not since_date:
+        since_date = datetime.now(assistant.tz) - timedelta(days=1)
+    
+    emails = assistant.google.get_emails_since(
+        since_date=since_date,
+        max_results=20,
+        exclude_promotional=True,
+        exclusion_domains=assistant.exclusion_domains,
+        inbound_only=True,  # Only show inbound emails
+        since_history_id=getattr(assistant, 'previous_history_id', None)
+    )
+    
+    # Format for display and prioritize response-requested emails
+    email_list = []
+    response_required = []
+    regular_emails = []
+    
+    for email in emails:
+        email_item = {
+            'id': email.get('id'),
+            'from': email.get('from', ''),
+            'subject': email.get('subject', 'No subject'),
+            'snippet': email.get('snippet', ''),
+            'date': email.get('date', ''),
+            'requires_response': email.get('requires_response', False),
+            'gmail_link': f"https://mail.google.com/mail/u/0/#inbox/{email.get('id')}"
+        }
+        
+        if email_item['requires_response']:
+            response_required.append(email_item)
+        else:
+            regular_emails.append(email_item)
+    
+    # Sort: response-required emails first, then regular emails
+    email_list = response_required + regular_emails
+    email_list = email_list[:10]  # Limit to 10 total
+    
+    return {'emails': email_list}
+
+def fetch_news(assistant, topic: str = 'general', limit: int = 20) -> dict:
+    """Build the news panel for a topic"""
+    if not assistant.news:
+        raise RuntimeError('News service not available')
+    
+    articles = assistant.news.get_news_by_topic(topic=topic, limit=limit)
+    return {'articles': articles, 'topic': topic}
+
+def get_fallback_reddit():
+    """Get or create the read-only Reddit client used when Reddit services aren't configured"""
+    global fallback_reddit
+    if not HAS_PRAW:
+        raise ImportError("praw package required. Install with: pip install praw")
+    if fallback_reddit is None:
+        # Environment is already loaded from .env by assistant.py
+        fallback_reddit = praw.Reddit(
+            client_id=os.getenv('REDDIT_CLIENT_ID', ''),
+            client_secret=os.getenv('REDDIT_CLIENT_SECRET', ''),
+            user_agent=os.getenv('REDDIT_USER_AGENT', 'ExecutiveAssistant/1.0')
+        )
+    return fallback_reddit
+
+def fetch_reddit_posts(assistant, limit: int = 5) -> dict:
+    """Build the Reddit panel"""
+    if assistant.reddit:
+        # Try to get from subscribed subreddits
+        posts = assistant.reddit.get_top_posts_from_my_subreddits(
+            time_filter='day',
+            total_limit=limit
+        )
+    else:
+        # Fallback to popular/trending
+        try:
+            reddit = get_fallback_reddit()
+            
+            posts = []
+            for post in reddit.subreddit('popular').hot(limit=limit):
+                posts.append({
+                    'title': post.title,
+                    'score': post.score,
+                    'subreddit': post.subreddit.display_name,
+                    'url': post.url,
+                    'permalink': f"https://reddit.com{post.permalink}",
+                    'num_comments': post.num_comments
+                })
+        except Exception as e:
+            raise RuntimeError(f'Reddit not available: {str(e)}')
+    
+    return {'posts': posts}
+
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """Handle chat messages, streaming the response as Server-Sent Events"""
+    data = request.json
+    message = data.get('message', '')
+    
+    if not message:
+        return jsonify({'error': 'No message provided'}), 400
+    
+    assistant = get_assistant()
+    if not assistant:
+        return jsonify({'error': 'Assistant not initialized'}), 500
+    
+    def generate():
+        try:
+            for event in assistant.chat_stream(message):
+                yield f"data: {json.dumps(event)}\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+        yield f"data: {json.dumps({'type': 'done'})}\n\n"
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/calendar/upcoming', methods=['GET'])
 def get_upcoming_calendar():
     """Get upcoming calendar events - exactly 10 events"""
@@ -64,48 +272,7 @@ def get_upcoming_calendar():
         return jsonify({'error': 'Assistant not initialized'}), 500
     
     try:
-        events = assistant.google.get_events(days_ahead=60)  # Get more to ensure we have 10
-        
-        # Sort by start time and get exactly next 10
-        upcoming_events = []
-        now = datetime.now(assistant.tz)
-        
-        for event in events:
-            start_str = event.get('start', {}).get('dateTime') or event.get('start', {}).get('date')
-            if not start_str:
-                continue
-            
-            try:
-                if 'T' in start_str:
-                    start = datetime.fromisoformat(start_str.replace('Z', '+00:00'))
-                else:
-                    start = datetime.fromisoformat(start_str)
-                    start = start.replace(tzinfo=assistant.tz)
-                
-                if start >= now:
-                    # Check if priority
-                    from assistant import PRIORITY_KEYWORDS
-                    summary = event.get('summary', '').lower()
-                    is_priority = any(keyword in summary for keyword in PRIORITY_KEYWORDS)
-                    
-                    upcoming_events.append({
-                        'id': event.get('id'),
-                        'title': event.get('summary', 'No title'),
-                        'start': start.isoformat(),
-                        'start_display': start.strftime('%A, %B %d at %I:%M %p'),
-                        'location': event.get('location', ''),
-                        'description': event.get('description', ''),
-                        'htmlLink': event.get('htmlLink', ''),
-                        'is_priority': is_priority
-                    })
-            except Exception as e:
-                continue
-        
-        # Sort by start time and take exactly 10
-        upcoming_events.sort(key=lambda x: x['start'])
-        upcoming_events = upcoming_events[:10]
-        
-        return jsonify({'events': upcoming_events})  # Return exactly 10 or less
+        return jsonify(fetch_upcoming_calendar(assistant))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -117,48 +284,48 @@ def get_recent_emails():
         return jsonify({'error': 'Assistant not initialized'}), 500
     
     try:
-        # Get emails since last login or last 24 hours
-        since_date = getattr(assistant, 'previous_login', None)
-        if not since_date:
-            since_date = datetime.now(assistant.tz) - timedelta(days=1)
-        
-        emails = assistant.google.get_emails_since(
-            since_date=since_date,
-            max_results=20,
-            exclude_promotional=True,
-            exclusion_domains=assistant.exclusion_domains,
-            inbound_only=True  # Only show inbound emails
-        )
-        
-        # Format for display and prioritize response-requested emails
-        email_list = []
-        response_required = []
-        regular_emails = []
-        
-        for email in emails:
-            email_item = {
-                'id': email.get('id'),
-                'from': email.get('from', ''),
-                'subject': email.get('subject', 'No subject'),
-                'snippet': email.get('snippet', ''),
-                'date': email.get('date', ''),
-                'requires_response': email.get('requires_response', False),
-                'gmail_link': f"https://mail.google.com/mail/u/0/#inbox/{email.get('id')}"
-            }
-            
-            if email_item['requires_response']:
-                response_required.append(email_item)
-            else:
-                regular_emails.append(email_item)
-        
-        # Sort: response-required emails first, then regular emails
-        email_list = response_required + regular_emails
-        email_list = email_list[:10]  # Limit to 10 total
-        
-        return jsonify({'emails': email_list})
+        return jsonify(fetch_recent_emails(assistant))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/dashboard', methods=['GET'])
+def get_dashboard():
+    """Get all dashboard panels in one request, fetched concurrently"""
+    topic = request.args.get('topic', 'general')
+    news_limit = int(request.args.get('news_limit', 20))
+    reddit_limit = int(request.args.get('reddit_limit', 5))
+    
+    assistant = get_assistant()
+    if not assistant:
+        return jsonify({'error': 'Assistant not initialized'}), 500
+    
+    panels = {
+        'calendar': (fetch_upcoming_calendar, ()),
+        'emails': (fetch_recent_emails, ()),
+        'news': (fetch_news, (topic, news_limit)),
+        'reddit': (fetch_reddit_posts, (reddit_limit,))
+    }
+    
+    # Each panel is network-bound, so overlap the waits and report
+    # failures per panel instead of failing the whole dashboard
+    dashboard = {}
+    with ThreadPoolExecutor(max_workers=len(panels)) as executor:
+        futures = {
+            name: executor.submit(func, assistant, *args)
+            for name, (func, args) in panels.items()
+        }
+        for name, future in futures.items():
+            try:
+                dashboard[name] = future.result()
+            except Exception as e:
+                dashboard[name] = {'error': str(e)}
+    
+    response = jsonify(dashboard)
+    if any('error' in panel for panel in dashboard.values()):
+        # Don't let the browser hold on to a failed panel
+        response.headers['Cache-Control'] = 'no-store'
+    return response
+
 @app.route('/api/emails/exclusions', methods=['GET', 'POST', 'DELETE'])
 def manage_exclusions():
     """Manage email exclusion domains"""
@@ -200,8 +367,7 @@ def get_news():
         return jsonify({'error': 'News service not available'}), 500
     
     try:
-        articles = assistant.news.get_news_by_topic(topic=topic, limit=limit)
-        return jsonify({'articles': articles, 'topic': topic})
+        return jsonify(fetch_news(assistant, topic=topic, limit=limit))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -215,40 +381,7 @@ def get_reddit_posts():
         return jsonify({'error': 'Assistant not initialized'}), 500
     
     try:
-        if assistant.reddit:
-            # Try to get from subscribed subreddits
-            posts = assistant.reddit.get_top_posts_from_my_subreddits(
-                time_filter='day',
-                total_limit=limit
-            )
-        else:
-            # Fallback to popular/trending
-            try:
-                import praw
-                from dotenv import load_dotenv
-                import os
-                load_dotenv()
-                
-                reddit = praw.Reddit(
-                    client_id=os.getenv('REDDIT_CLIENT_ID', ''),
-                    client_secret=os.getenv('REDDIT_CLIENT_SECRET', ''),
-                    user_agent=os.getenv('REDDIT_USER_AGENT', 'ExecutiveAssistant/1.0')
-                )
-                
-                posts = []
-                for post in reddit.subreddit('popular').hot(limit=limit):
-                    posts.append({
-                        'title': post.title,
-                        'score': post.score,
-                        'subreddit': post.subreddit.display_name,
-                        'url': post.url,
-                        'permalink': f"https://reddit.com{post.permalink}",
-                        'num_comments': post.num_comments
-                    })
-            except Exception as e:
-                return jsonify({'error': f'Reddit not available: {str(e)}'}), 500
-        
-        return jsonify({'posts': posts})
+        return jsonify(fetch_reddit_posts(assistant, limit=limit))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -296,7 +429,8 @@ def set_llm_provider():
         if success:
             # Reset assistant instance so it reinitializes with new provider
             global assistant
-            assistant = None
+            with assistant_lock:
+                assistant = None
             return jsonify({'success': True, 'provider': provider_id, 'message': 'Provider updated successfully'})
         else:
             return jsonify({'error': 'Failed to set provider'}), 500
@@ -304,5 +438,5 @@ def set_llm_provider():
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5001)
+    app.run(debug=True, host='0.0.0.0', port=5001, threaded=True)
 
@@ -1,38 +1,37 @@
 # assistant.py
 import os
+import re
 import json
-from datetime import datetime, timedelta
-from typing import Optional, List
+import time
+import importlib.util
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, List, Iterator, Generator
 from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
-from google_services import GoogleServices
+from google_services import GoogleServices, normalize_exclusion_domain
 from llm_providers import get_llm_provider, LLMProvider
 
-# Try to import Reddit services (optional)
-try:
-    from reddit_services import RedditServices
-    HAS_REDDIT = True
-except ImportError:
-    HAS_REDDIT = False
-except Exception as e:
-    HAS_REDDIT = False
-    print(f"Warning: Reddit services not available: {e}")
+# Reddit and News services are imported on first use; only check their dependencies here
+HAS_REDDIT = importlib.util.find_spec('praw') is not None
+HAS_NEWS = importlib.util.find_spec('requests') is not None
 
-# Try to import News services (optional)
+# Use orjson for tool results if available (much faster for large payloads)
 try:
-    from news_services import NewsServices, RSSNewsServices
-    HAS_NEWS = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_NEWS = False
-except Exception as e:
-    HAS_NEWS = False
-    print(f"Warning: News services not available: {e}")
+    HAS_ORJSON = False
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Default timezone
 DEFAULT_TIMEZONE = 'America/New_York'
+DEFAULT_TZ = ZoneInfo(DEFAULT_TIMEZONE)
 
 # Priority keywords for flagging important events
 PRIORITY_KEYWORDS = [
@@ -41,6 +40,303 @@ PRIORITY_KEYWORDS = [
     'submission', 'due date', 'exam', 'flight', 'doctor'
 ]
 
+# Day/month names for hand-formatting dates in hot paths (avoids strftime's locale machinery)
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+MONTH_NAMES = (
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+)
+
+
+def format_day_date(dt: date) -> str:
+    """Format as 'Thursday, January 08' (same as strftime('%A, %B %d'))."""
+    return f"{DAY_NAMES[dt.weekday()]}, {MONTH_NAMES[dt.month - 1]} {dt.day:02d}"
+
+
+def format_clock_time(dt: datetime) -> str:
+    """Format as '08:30 PM' (same as strftime('%I:%M %p'))."""
+    return f"{dt.hour % 12 or 12:02d}:{dt.minute:02d} {'AM' if dt.hour < 12 else 'PM'}"
+
+
+# Calendar event fields passed to the LLM (the full resource is several times larger)
+TOOL_EVENT_FIELDS = ('id', 'summary', 'start', 'end', 'location', 'description',
+                     'htmlLink', 'status', 'organizer', 'attendees')
+MAX_TOOL_EVENT_ATTENDEES = 5
+# Most events/emails serialized into a single tool result
+MAX_TOOL_EVENTS = 50
+MAX_TOOL_EMAILS = 50
+
+# Shared pool for running a turn's tool calls concurrently (kept alive between turns)
+TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='tool')
+
+
+def to_json(obj) -> str:
+    """Serialize a tool result to a JSON string."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=str)
+
+
+def load_json_file(path: str):
+    """Read a JSON file."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def save_json_file(path: str, payload):
+    """Write a JSON file with two-space indentation."""
+    if HAS_ORJSON:
+        data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(payload, indent=2).encode()
+    # Write a temp file in the same directory and rename it over the target, so a crash
+    # mid-write never leaves a truncated file (and concurrent writers never share a temp file)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def slim_event(event: dict) -> dict:
+    """Keep only the calendar event fields the LLM uses."""
+    slim = {field: event[field] for field in TOOL_EVENT_FIELDS if field in event}
+    if 'attendees' in slim:
+        slim['attendees'] = slim['attendees'][:MAX_TOOL_EVENT_ATTENDEES]
+    return slim
+
+
+def message_chars(msg: dict) -> int:
+    """Approximate the text size of a history message."""
+    content = msg['content']
+    if isinstance(content, str):
+        return len(content)
+    total = 0
+    for block in content:
+        if isinstance(block, dict):
+            total += len(str(block.get('content', ''))) + len(str(block.get('input', '')))
+        else:
+            total += len(getattr(block, 'text', None) or '') + len(str(getattr(block, 'input', None) or ''))
+    return total
+
+
+# Conversation history limits - older turns are folded into a running summary,
+# and large tool results from older turns are replaced with a placeholder
+MAX_HISTORY_MESSAGES = 40
+KEEP_HISTORY_MESSAGES = 20
+STALE_TOOL_RESULT_CHARS = 500
+# Also compact when the history text grows past this many characters (~4 chars per token)
+MAX_HISTORY_CHARS = 80000
+KEEP_HISTORY_CHARS = 40000
+
+# Single-pass matcher so each summary is scanned once for all keywords
+PRIORITY_RE = re.compile('|'.join(map(re.escape, PRIORITY_KEYWORDS)), re.IGNORECASE)
+
+
+def is_priority(summary: str) -> bool:
+    """Check whether an event summary contains any priority keyword."""
+    return PRIORITY_RE.search(summary) is not None
+
+# Stable system instructions - the per-request time context is sent after these
+SYSTEM_PROMPT = f"""You are an executive assistant with access to the user's Gmail and Google Calendar.
+Your job is to help manage their schedule efficiently.
+
+CRITICAL DATE HANDLING:
+- Use the reference dates in the current time context (after these instructions) to determine the correct date for any day mentioned
+- "This Thursday" means the Thursday shown in the reference dates
+- Always use ISO format with timezone offset: YYYY-MM-DDTHH:MM:SS-05:00 (for EST) or -04:00 (for EDT)
+- Currently we are in EST (Eastern Standard Time), so use -05:00
+- Double-check the date before creating any event
+
+Key responsibilities:
+1. Schedule events based on natural language requests
+2. Find free times when asked
+3. Check emails for scheduling requests and suggest times
+4. ALWAYS flag conflicts with important events (interviews, deadlines, presentations)
+5. Suggest alternative times when conflicts exist
+6. Delete events when requested
+7. Provide email updates since last login (automatically on startup)
+8. Manage exclusion list for filtering promotional emails
+
+DELETING EVENTS:
+- When the user asks to delete/remove/cancel an event, first use find_event to search for it
+- If multiple events match, list them and ask the user to confirm which one to delete
+- Always confirm the event details (name and date/time) before deleting
+- Use the event ID from find_event to delete the correct event
+
+Priority keywords to watch for: {', '.join(PRIORITY_KEYWORDS)}
+
+When creating events:
+1. First, determine the correct date using the reference dates provided
+2. Check for conflicts
+3. Create the event with the EXACT date from the reference
+4. Confirm the day and date with the user in your response"""
+
+# Tools available to the LLM (constant for the life of the process)
+TOOLS = [
+    {
+        "name": "get_calendar_events",
+        "description": "Get calendar events for the next N days",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "days_ahead": {
+                    "type": "integer",
+                    "description": "Number of days to look ahead (default 7)"
+                }
+            }
+        }
+    },
+    {
+        "name": "find_free_times",
+        "description": "Find available time slots in the calendar",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "days_ahead": {
+                    "type": "integer",
+                    "description": "Number of days to search (default 7)"
+                },
+                "duration_minutes": {
+                    "type": "integer",
+                    "description": "Required slot duration in minutes (default 60)"
+                }
+            }
+        }
+    },
+    {
+        "name": "create_calendar_event",
+        "description": "Create a new calendar event. IMPORTANT: Use the exact date from the reference dates provided. All times are in Eastern Time.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "summary": {"type": "string", "description": "Event title"},
+                "start_time": {
+                    "type": "string", 
+                    "description": "Start time in ISO format with timezone, e.g., '2026-01-08T20:30:00-05:00' for 8:30 PM ET. MUST include the -05:00 (EST) or -04:00 (EDT) offset."
+                },
+                "duration_minutes": {"type": "integer", "description": "Event duration in minutes"},
+                "description": {"type": "string", "description": "Event description (optional)"},
+                "location": {"type": "string", "description": "Event location (optional)"}
+            },
+            "required": ["summary", "start_time", "duration_minutes"]
+        }
+    },
+    {
+        "name": "search_emails",
+        "description": "Search emails for scheduling-related content",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Search query for emails"}
+            }
+        }
+    },
+    {
+        "name": "check_conflicts",
+        "description": "Check if a proposed time has conflicts, especially with priority events",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "start_time": {"type": "string", "description": "Start time in ISO format with timezone offset"},
+                "end_time": {"type": "string", "description": "End time in ISO format with timezone offset"}
+            },
+            "required": ["start_time", "end_time"]
+        }
+    },
+    {
+        "name": "find_event",
+        "description": "Search for calendar events by name/keyword. Use this to find an event before deleting it.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "search_term": {
+                    "type": "string",
+                    "description": "The name or keyword to search for in event titles"
+                },
+                "days_ahead": {
+                    "type": "integer",
+                    "description": "Number of days to search ahead (default 30)"
+                }
+            },
+            "required": ["search_term"]
+        }
+    },
+    {
+        "name": "delete_event",
+        "description": "Delete a calendar event by its ID. Always use find_event first to get the correct event ID, and confirm with the user before deleting.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "event_id": {
+                    "type": "string",
+                    "description": "The unique ID of the event to delete"
+                },
+                "event_summary": {
+                    "type": "string",
+                    "description": "The name of the event (for confirmation logging)"
+                }
+            },
+            "required": ["event_id"]
+        }
+    },
+    {
+        "name": "get_new_emails_since_login",
+        "description": "Get new emails received since the last login. Only includes emails from primary mailbox, excluding promotional/marketing emails.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of emails to return (default 20)"
+                }
+            }
+        }
+    },
+    {
+        "name": "add_exclusion_domain",
+        "description": "Add a domain or URL to the exclusion list to filter out promotional emails from that sender.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "domain": {
+                    "type": "string",
+                    "description": "Domain name or URL to exclude (e.g., 'example.com' or 'newsletter.example.com')"
+                }
+            },
+            "required": ["domain"]
+        }
+    },
+    {
+        "name": "remove_exclusion_domain",
+        "description": "Remove a domain from the exclusion list.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "domain": {
+                    "type": "string",
+                    "description": "Domain name to remove from exclusion list"
+                }
+            },
+            "required": ["domain"]
+        }
+    },
+    {
+        "name": "get_exclusion_domains",
+        "description": "Get the list of excluded domains/URLs.",
+        "input_schema": {
+            "type": "object",
+            "properties": {}
+        }
+    }
+]
+
 
 class ExecutiveAssistant:
     def __init__(
@@ -77,556 +373,553 @@ class ExecutiveAssistant:
             )
         
         self.conversation_history = []
-        self.tz = ZoneInfo(DEFAULT_TIMEZONE)
+        self.conversation_summary = ''
+        self._pending_summary = None  # background summarization of dropped turns
+        self.tz = DEFAULT_TZ
+        self._time_context_cache = (None, '')  # (minute, rendered context)
+        self._week_context_cache = (None, '')  # (day ordinal, rendered week lines)
         self.state_file = 'assistant_state.json'
         self.exclusion_file = 'email_exclusions.json'
+        self._exclusions_lock = threading.Lock()  # tools may run concurrently
         
-        # Initialize Reddit services (optional)
-        self.reddit = None
-        if HAS_REDDIT:
-            try:
-                self.reddit = RedditServices()
-            except Exception as e:
-                print(f"Warning: Could not initialize Reddit services: {e}")
-                print("Reddit features will be disabled. Set REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET in .env to enable.")
-        
-        # Initialize News services (optional)
-        self.news = None
-        if HAS_NEWS:
-            try:
-                # Try NewsAPI first (requires API key)
-                self.news = NewsServices()
-            except ValueError:
-                # Fall back to RSS feeds if no API key
-                try:
-                    print("NewsAPI key not found. Using RSS feeds instead (no API key required).")
-                    self.news = RSSNewsServices()
-                except ImportError:
-                    print("feedparser not installed. Install with: pip install feedparser")
-                    self.news = None
-                except Exception as e:
-                    print(f"Warning: Could not initialize News services: {e}")
-                    self.news = None
-            except Exception as e:
-                print(f"Warning: Could not initialize News services: {e}")
-                print("News features will be disabled. Set NEWS_API_KEY in .env to enable NewsAPI, or install feedparser for RSS feeds.")
+        # Tool name -> handler; each handler takes the tool input and returns a JSON string
+        self._tool_handlers = {
+            "get_calendar_events": self._tool_get_calendar_events,
+            "find_free_times": self._tool_find_free_times,
+            "create_calendar_event": self._tool_create_calendar_event,
+            "search_emails": self._tool_search_emails,
+            "check_conflicts": self._tool_check_conflicts,
+            "find_event": self._tool_find_event,
+            "delete_event": self._tool_delete_event,
+            "get_new_emails_since_login": self._tool_get_new_emails_since_login,
+            "add_exclusion_domain": self._tool_add_exclusion_domain,
+            "remove_exclusion_domain": self._tool_remove_exclusion_domain,
+            "get_exclusion_domains": self._tool_get_exclusion_domains,
+        }
         
         self._load_state()
         # Store previous login before updating
         self.previous_login = self.last_login
+        self.previous_history_id = self.last_history_id
         self._update_last_login()
     
+    @cached_property
+    def reddit(self):
+        """Reddit services, created on first use (None if unavailable)."""
+        if not HAS_REDDIT:
+            return None
+        try:
+            from reddit_services import RedditServices
+            return RedditServices()
+        except Exception as e:
+            print(f"Warning: Could not initialize Reddit services: {e}")
+            print("Reddit features will be disabled. Set REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET in .env to enable.")
+            return None
+    
+    @cached_property
+    def news(self):
+        """News services, created on first use (None if unavailable)."""
+        if not HAS_NEWS:
+            return None
+        try:
+            from news_services import NewsServices, RSSNewsServices
+        except Exception as e:
+            print(f"Warning: News services not available: {e}")
+            return None
+        try:
+            # Try NewsAPI first (requires API key)
+            return NewsServices()
+        except ValueError:
+            # Fall back to RSS feeds if no API key
+            try:
+                print("NewsAPI key not found. Using RSS feeds instead (no API key required).")
+                return RSSNewsServices()
+            except ImportError:
+                print("feedparser not installed. Install with: pip install feedparser")
+            except Exception as e:
+                print(f"Warning: Could not initialize News services: {e}")
+        except Exception as e:
+            print(f"Warning: Could not initialize News services: {e}")
+            print("News features will be disabled. Set NEWS_API_KEY in .env to enable NewsAPI, or install feedparser for RSS feeds.")
+        return None
+    
     def _load_state(self):
         """Load assistant state (last login, exclusion list, etc.)."""
         self.last_login = None
-        self.exclusion_domains = []
+        self.last_history_id = None
+        self.exclusion_domains = set()
         
         # Load last login time
         if os.path.exists(self.state_file):
             try:
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
-                    if 'last_login' in state:
-                        last_login_str = state['last_login']
-                        # Handle both timezone-aware and naive datetime strings
-                        if '+' in last_login_str or last_login_str.endswith('Z'):
-                            self.last_login = datetime.fromisoformat(last_login_str.replace('Z', '+00:00'))
-                        else:
-                            self.last_login = datetime.fromisoformat(last_login_str)
-                            self.last_login = self.last_login.replace(tzinfo=self.tz)
+                state = load_json_file(self.state_file)
+                if 'last_login' in state:
+                    # Stored in UTC; files written before that hold naive Eastern times
+                    last_login = datetime.fromisoformat(state['last_login'].replace('Z', '+00:00'))
+                    if last_login.tzinfo is None:
+                        last_login = last_login.replace(tzinfo=self.tz)
+                    self.last_login = last_login.astimezone(self.tz)
+                self.last_history_id = state.get('last_history_id')
             except Exception as e:
                 print(f"Warning: Could not load state: {e}")
         
         # Load exclusion domains
         if os.path.exists(self.exclusion_file):
             try:
-                with open(self.exclusion_file, 'r') as f:
-                    exclusions = json.load(f)
-                    self.exclusion_domains = exclusions.get('domains', [])
+                exclusions = load_json_file(self.exclusion_file)
+                stored = set(exclusions.get('domains', []))
+                # Entries saved as URLs or addresses are migrated to their domain
+                self.exclusion_domains = set(filter(None, map(normalize_exclusion_domain, stored)))
+                if self.exclusion_domains != stored:
+                    self._save_exclusions()
             except Exception as e:
                 print(f"Warning: Could not load exclusions: {e}")
     
     def _save_state(self):
         """Save assistant state."""
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump({
-                    'last_login': datetime.now(self.tz).isoformat()
-                }, f, indent=2)
+            save_json_file(self.state_file, {
+                'last_login': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+                'last_history_id': self.last_history_id
+            })
         except Exception as e:
             print(f"Warning: Could not save state: {e}")
     
     def _save_exclusions(self):
         """Save exclusion domains list."""
         try:
-            with open(self.exclusion_file, 'w') as f:
-                json.dump({
-                    'domains': self.exclusion_domains
-                }, f, indent=2)
+            save_json_file(self.exclusion_file, {
+                'domains': sorted(self.exclusion_domains)
+            })
         except Exception as e:
             print(f"Warning: Could not save exclusions: {e}")
     
     def _update_last_login(self):
-        """Update last login timestamp."""
+        """Update last login timestamp and the Gmail history ID to sync from next time."""
         self.last_login = datetime.now(self.tz)
+        self.last_history_id = self.google.get_history_id()
         self._save_state()
     
     def add_exclusion_domain(self, domain: str) -> bool:
         """Add a domain to the exclusion list."""
-        domain = domain.lower().strip()
-        if domain and domain not in self.exclusion_domains:
-            self.exclusion_domains.append(domain)
-            self._save_exclusions()
-            return True
+        domain = normalize_exclusion_domain(domain)
+        with self._exclusions_lock:
+            if domain and domain not in self.exclusion_domains:
+                # Replace rather than mutate so concurrent readers never iterate a changing set
+                self.exclusion_domains = self.exclusion_domains | {domain}
+                self._save_exclusions()
+                return True
         return False
     
     def remove_exclusion_domain(self, domain: str) -> bool:
         """Remove a domain from the exclusion list."""
-        domain = domain.lower().strip()
-        if domain in self.exclusion_domains:
-            self.exclusion_domains.remove(domain)
-            self._save_exclusions()
-            return True
+        domain = normalize_exclusion_domain(domain)
+        with self._exclusions_lock:
+            if domain in self.exclusion_domains:
+                self.exclusion_domains = self.exclusion_domains - {domain}
+                self._save_exclusions()
+                return True
         return False
     
     def get_exclusion_domains(self) -> List[str]:
         """Get list of excluded domains."""
-        return self.exclusion_domains.copy()
+        return sorted(self.exclusion_domains)
     
     def _get_current_time_context(self) -> str:
         """Get detailed current time context to help Claude with date calculations."""
+        # The context only has minute resolution, so reuse it within the same minute
+        # (an identical string also keeps the request prefix stable)
+        minute = int(time.time() // 60)
+        if self._time_context_cache[0] == minute:
+            return self._time_context_cache[1]
+        
         now = datetime.now(self.tz)
+        weekday = now.weekday()
+        
+        context = f"""Current date/time: {format_day_date(now)}, {now.year} at {format_clock_time(now)} Eastern Time
+Today's date: {now.date().isoformat()} ({DAY_NAMES[weekday]})
+
+{self._get_week_context(now.toordinal(), weekday)}
+All times should be interpreted as Eastern Time unless otherwise specified."""
+        
+        self._time_context_cache = (minute, context)
+        return context
+    
+    def _get_week_context(self, today: int, weekday: int) -> str:
+        """Render the date-only part of the time context (changes once a day)."""
+        if self._week_context_cache[0] == today:
+            return self._week_context_cache[1]
         
         # Calculate this week's dates
         days_of_week = []
         for i in range(7):
-            day = now + timedelta(days=i)
-            day_name = day.strftime('%A')
-            day_date = day.strftime('%Y-%m-%d')
-            days_of_week.append(f"{day_name} = {day_date}")
+            day = date.fromordinal(today + i)
+            days_of_week.append(f"{DAY_NAMES[(weekday + i) % 7]} = {day.isoformat()}")
         
-        return f"""Current date/time: {now.strftime('%A, %B %d, %Y at %I:%M %p')} Eastern Time
-Today's date: {now.strftime('%Y-%m-%d')} ({now.strftime('%A')})
-
-This week's dates for reference:
+        thursday = date.fromordinal(today + (3 - weekday) % 7)
+        
+        week_context = f"""This week's dates for reference:
 {chr(10).join(days_of_week)}
 
-IMPORTANT: When the user says "this Thursday", they mean {(now + timedelta(days=(3 - now.weekday()) % 7)).strftime('%A, %B %d, %Y')} (the Thursday of this current week).
-All times should be interpreted as Eastern Time unless otherwise specified."""
+IMPORTANT: When the user says "this Thursday", they mean {format_day_date(thursday)}, {thursday.year} (the Thursday of this current week)."""
+        
+        self._week_context_cache = (today, week_context)
+        return week_context
     
-    def _check_priority_conflicts(self, start: datetime, end: datetime) -> list:
-        """Check if there are priority conflicts."""
-        conflicts = self.google.check_conflicts(start, end)
+    def _check_priority_conflicts(self, start: datetime, end: datetime,
+                                  conflicts: Optional[list] = None) -> list:
+        """Check if there are priority conflicts (reuses already-fetched conflicts if given)."""
+        if conflicts is None:
+            conflicts = self.google.check_conflicts(start, end)
         priority_conflicts = []
         
         for event in conflicts:
-            summary = event.get('summary', '').lower()
-            if any(keyword in summary for keyword in PRIORITY_KEYWORDS):
+            if is_priority(event.get('summary', '')):
                 priority_conflicts.append(event)
         
         return priority_conflicts
     
-    def _build_tools(self) -> list:
-        """Define tools available to Claude."""
-        return [
-            {
-                "name": "get_calendar_events",
-                "description": "Get calendar events for the next N days",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "days_ahead": {
-                            "type": "integer",
-                            "description": "Number of days to look ahead (default 7)"
-                        }
-                    }
-                }
-            },
-            {
-                "name": "find_free_times",
-                "description": "Find available time slots in the calendar",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "days_ahead": {
-                            "type": "integer",
-                            "description": "Number of days to search (default 7)"
-                        },
-                        "duration_minutes": {
-                            "type": "integer",
-                            "description": "Required slot duration in minutes (default 60)"
-                        }
-                    }
-                }
-            },
-            {
-                "name": "create_calendar_event",
-                "description": "Create a new calendar event. IMPORTANT: Use the exact date from the reference dates provided. All times are in Eastern Time.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "summary": {"type": "string", "description": "Event title"},
-                        "start_time": {
-                            "type": "string", 
-                            "description": "Start time in ISO format with timezone, e.g., '2026-01-08T20:30:00-05:00' for 8:30 PM ET. MUST include the -05:00 (EST) or -04:00 (EDT) offset."
-                        },
-                        "duration_minutes": {"type": "integer", "description": "Event duration in minutes"},
-                        "description": {"type": "string", "description": "Event description (optional)"},
-                        "location": {"type": "string", "description": "Event location (optional)"}
-                    },
-                    "required": ["summary", "start_time", "duration_minutes"]
-                }
-            },
-            {
-                "name": "search_emails",
-                "description": "Search emails for scheduling-related content",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "query": {"type": "string", "description": "Search query for emails"}
-                    }
-                }
-            },
-            {
-                "name": "check_conflicts",
-                "description": "Check if a proposed time has conflicts, especially with priority events",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "start_time": {"type": "string", "description": "Start time in ISO format with timezone offset"},
-                        "end_time": {"type": "string", "description": "End time in ISO format with timezone offset"}
-                    },
-                    "required": ["start_time", "end_time"]
-                }
-            },
-            {
-                "name": "find_event",
-                "description": "Search for calendar events by name/keyword. Use this to find an event before deleting it.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "search_term": {
-                            "type": "string",
-                            "description": "The name or keyword to search for in event titles"
-                        },
-                        "days_ahead": {
-                            "type": "integer",
-                            "description": "Number of days to search ahead (default 30)"
-                        }
-                    },
-                    "required": ["search_term"]
-                }
-            },
-            {
-                "name": "delete_event",
-                "description": "Delete a calendar event by its ID. Always use find_event first to get the correct event ID, and confirm with the user before deleting.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "event_id": {
-                            "type": "string",
-                            "description": "The unique ID of the event to delete"
-                        },
-                        "event_summary": {
-                            "type": "string",
-                            "description": "The name of the event (for confirmation logging)"
-                        }
-                    },
-                    "required": ["event_id"]
-                }
-            },
-            {
-                "name": "get_new_emails_since_login",
-                "description": "Get new emails received since the last login. Only includes emails from primary mailbox, excluding promotional/marketing emails.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "max_results": {
-                            "type": "integer",
-                            "description": "Maximum number of emails to return (default 20)"
-                        }
-                    }
-                }
-            },
-            {
-                "name": "add_exclusion_domain",
-                "description": "Add a domain or URL to the exclusion list to filter out promotional emails from that sender.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "domain": {
-                            "type": "string",
-                            "description": "Domain name or URL to exclude (e.g., 'example.com' or 'newsletter.example.com')"
-                        }
-                    },
-                    "required": ["domain"]
-                }
-            },
-            {
-                "name": "remove_exclusion_domain",
-                "description": "Remove a domain from the exclusion list.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "domain": {
-                            "type": "string",
-                            "description": "Domain name to remove from exclusion list"
-                        }
-                    },
-                    "required": ["domain"]
-                }
-            },
-            {
-                "name": "get_exclusion_domains",
-                "description": "Get the list of excluded domains/URLs.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {}
-                }
-            }
-        ]
-    
     def _execute_tool(self, tool_name: str, tool_input: dict) -> str:
         """Execute a tool and return the result."""
+        handler = self._tool_handlers.get(tool_name)
+        if handler is None:
+            return to_json({"error": f"Unknown tool: {tool_name}"})
         try:
-            if tool_name == "get_calendar_events":
-                days = tool_input.get("days_ahead", 7)
-                events = self.google.get_events(days_ahead=days)
-                return json.dumps(events, default=str)
-            
-            elif tool_name == "find_free_times":
-                days = tool_input.get("days_ahead", 7)
-                duration = tool_input.get("duration_minutes", 60)
-                slots = self.google.find_free_slots(days_ahead=days, slot_duration_minutes=duration)
-                return json.dumps(slots[:10])  # Return top 10 slots
-            
-            elif tool_name == "create_calendar_event":
-                # Parse the start time - handle timezone properly
-                start_str = tool_input["start_time"]
-                
-                # Parse ISO format with timezone
-                if '+' in start_str or start_str.count('-') > 2:
-                    start = datetime.fromisoformat(start_str)
-                else:
-                    # No timezone provided, assume Eastern
-                    start = datetime.fromisoformat(start_str)
-                    start = start.replace(tzinfo=self.tz)
-                
-                # Ensure it's in Eastern time
-                start = start.astimezone(self.tz)
-                end = start + timedelta(minutes=tool_input["duration_minutes"])
-                
-                # Log for debugging
-                print(f"DEBUG: Creating event at {start.strftime('%A, %B %d, %Y at %I:%M %p %Z')}")
-                
-                # Check for priority conflicts first
-                priority_conflicts = self._check_priority_conflicts(start, end)
-                if priority_conflicts:
-                    conflict_info = [{"summary": e.get("summary"), "start": e["start"]} for e in priority_conflicts]
-                    return json.dumps({
-                        "warning": "PRIORITY CONFLICT DETECTED",
-                        "conflicts": conflict_info,
-                        "message": "This time conflicts with important events. Consider rescheduling."
-                    })
-                
-                event = self.google.create_event(
-                    summary=tool_input["summary"],
-                    start=start,
-                    end=end,
-                    description=tool_input.get("description", ""),
-                    location=tool_input.get("location", "")
-                )
-                return json.dumps({
-                    "success": True, 
-                    "event_id": event["id"], 
-                    "link": event.get("htmlLink"),
-                    "scheduled_for": start.strftime('%A, %B %d, %Y at %I:%M %p %Z')
-                })
-            
-            elif tool_name == "search_emails":
-                query = tool_input.get("query", "")
-                emails = self.google.get_recent_emails(query=query)
-                return json.dumps(emails)
-            
-            elif tool_name == "check_conflicts":
-                start = datetime.fromisoformat(tool_input["start_time"])
-                end = datetime.fromisoformat(tool_input["end_time"])
-                
-                # Ensure timezone
-                if start.tzinfo is None:
-                    start = start.replace(tzinfo=self.tz)
-                if end.tzinfo is None:
-                    end = end.replace(tzinfo=self.tz)
-                
-                conflicts = self.google.check_conflicts(start, end)
-                priority = self._check_priority_conflicts(start, end)
-                return json.dumps({
-                    "has_conflicts": len(conflicts) > 0,
-                    "conflicts": conflicts,
-                    "has_priority_conflicts": len(priority) > 0,
-                    "priority_conflicts": priority
-                }, default=str)
-            
-            elif tool_name == "find_event":
-                search_term = tool_input["search_term"]
-                days_ahead = tool_input.get("days_ahead", 30)
-                events = self.google.find_event_by_name(search_term, days_ahead)
-                
-                # Format events for easier reading
-                formatted_events = []
-                for event in events:
-                    start = event['start'].get('dateTime', event['start'].get('date'))
-                    formatted_events.append({
-                        "id": event['id'],
-                        "summary": event.get('summary', 'No title'),
-                        "start": start,
-                        "description": event.get('description', '')[:100] if event.get('description') else ''
-                    })
-                
-                return json.dumps({
-                    "found": len(formatted_events),
-                    "events": formatted_events
-                })
-            
-            elif tool_name == "delete_event":
-                event_id = tool_input["event_id"]
-                event_summary = tool_input.get("event_summary", "Unknown event")
-                
-                print(f"DEBUG: Deleting event '{event_summary}' (ID: {event_id})")
-                
-                success = self.google.delete_event(event_id)
-                
-                if success:
-                    return json.dumps({
-                        "success": True,
-                        "message": f"Successfully deleted event: {event_summary}"
-                    })
-                else:
-                    return json.dumps({
-                        "success": False,
-                        "message": f"Failed to delete event: {event_summary}. It may have already been deleted or the ID is invalid."
-                    })
-            
-            elif tool_name == "get_new_emails_since_login":
-                max_results = tool_input.get("max_results", 20)
-                
-                # Use previous_login if available (before this session), otherwise use last_login
-                since_date = getattr(self, 'previous_login', None) or self.last_login
-                
-                if since_date is None:
-                    # If no previous login, get emails from last 24 hours
-                    since_date = datetime.now(self.tz) - timedelta(days=1)
-                
-                emails = self.google.get_emails_since(
-                    since_date=since_date,
-                    max_results=max_results,
-                    exclude_promotional=True,
-                    exclusion_domains=self.exclusion_domains
-                )
-                
-                return json.dumps({
-                    "count": len(emails),
-                    "since": since_date.isoformat(),
-                    "emails": emails
-                }, default=str)
-            
-            elif tool_name == "add_exclusion_domain":
-                domain = tool_input["domain"]
-                success = self.add_exclusion_domain(domain)
-                
-                if success:
-                    return json.dumps({
-                        "success": True,
-                        "message": f"Added '{domain}' to exclusion list",
-                        "excluded_domains": self.get_exclusion_domains()
-                    })
-                else:
-                    return json.dumps({
-                        "success": False,
-                        "message": f"Domain '{domain}' is already in exclusion list or invalid"
-                    })
-            
-            elif tool_name == "remove_exclusion_domain":
-                domain = tool_input["domain"]
-                success = self.remove_exclusion_domain(domain)
-                
-                if success:
-                    return json.dumps({
-                        "success": True,
-                        "message": f"Removed '{domain}' from exclusion list",
-                        "excluded_domains": self.get_exclusion_domains()
-                    })
-                else:
-                    return json.dumps({
-                        "success": False,
-                        "message": f"Domain '{domain}' not found in exclusion list"
-                    })
-            
-            elif tool_name == "get_exclusion_domains":
-                domains = self.get_exclusion_domains()
-                return json.dumps({
-                    "count": len(domains),
-                    "domains": domains
-                })
-            
-            return json.dumps({"error": f"Unknown tool: {tool_name}"})
+            return handler(tool_input)
+        except Exception as e:
+            return to_json({"error": str(e)})
+    
+    def _tool_get_calendar_events(self, tool_input: dict) -> str:
+        """Handle the get_calendar_events tool."""
+        days = tool_input.get("days_ahead", 7)
+        events = self.google.get_events(days_ahead=days)
+        return to_json([slim_event(event) for event in events[:MAX_TOOL_EVENTS]])
+    
+    def _tool_find_free_times(self, tool_input: dict) -> str:
+        """Handle the find_free_times tool."""
+        days = tool_input.get("days_ahead", 7)
+        duration = tool_input.get("duration_minutes", 60)
+        # Only the first 10 slots are returned, so stop looking after those
+        slots = self.google.find_free_slots(days_ahead=days, slot_duration_minutes=duration, max_results=10)
+        return to_json(slots)
+    
+    def _tool_create_calendar_event(self, tool_input: dict) -> str:
+        """Handle the create_calendar_event tool."""
+        # Parse the start time once; 'Z' is spelled out for Python < 3.11
+        start = datetime.fromisoformat(tool_input["start_time"].replace('Z', '+00:00'))
+        if start.tzinfo is None:
+            # No timezone provided, assume Eastern
+            start = start.replace(tzinfo=self.tz)
+        elif start.tzinfo is not self.tz:
+            # Ensure it's in Eastern time
+            start = start.astimezone(self.tz)
+        end = start + timedelta(minutes=tool_input["duration_minutes"])
+        
+        # Log for debugging
+        print(f"DEBUG: Creating event at {start.strftime('%A, %B %d, %Y at %I:%M %p %Z')}")
+        
+        # Check for priority conflicts first
+        priority_conflicts = self._check_priority_conflicts(start, end)
+        if priority_conflicts:
+            conflict_info = [{"summary": e.get("summary"), "start": e["start"]} for e in priority_conflicts]
+            return to_json({
+                "warning": "PRIORITY CONFLICT DETECTED",
+                "conflicts": conflict_info,
+                "message": "This time conflicts with important events. Consider rescheduling."
+            })
         
+        event = self.google.create_event(
+            summary=tool_input["summary"],
+            start=start,
+            end=end,
+            description=tool_input.get("description", ""),
+            location=tool_input.get("location", "")
+        )
+        return to_json({
+            "success": True, 
+            "event_id": event["id"], 
+            "link": event.get("htmlLink"),
+            "scheduled_for": start.strftime('%A, %B %d, %Y at %I:%M %p %Z')
+        })
+    
+    def _tool_search_emails(self, tool_input: dict) -> str:
+        """Handle the search_emails tool."""
+        query = tool_input.get("query", "")
+        emails = self.google.get_recent_emails(query=query)
+        return to_json(emails)
+    
+    def _tool_check_conflicts(self, tool_input: dict) -> str:
+        """Handle the check_conflicts tool."""
+        start = datetime.fromisoformat(tool_input["start_time"])
+        end = datetime.fromisoformat(tool_input["end_time"])
+        
+        # Ensure timezone
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=self.tz)
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=self.tz)
+        
+        conflicts = self.google.check_conflicts(start, end)
+        priority = self._check_priority_conflicts(start, end, conflicts)
+        return to_json({
+            "has_conflicts": len(conflicts) > 0,
+            "conflicts": [slim_event(event) for event in conflicts[:MAX_TOOL_EVENTS]],
+            "has_priority_conflicts": len(priority) > 0,
+            "priority_conflicts": [slim_event(event) for event in priority[:MAX_TOOL_EVENTS]]
+        })
+    
+    def _tool_find_event(self, tool_input: dict) -> str:
+        """Handle the find_event tool."""
+        search_term = tool_input["search_term"]
+        days_ahead = tool_input.get("days_ahead", 30)
+        events = self.google.find_event_by_name(search_term, days_ahead)
+        
+        # Format events for easier reading
+        formatted_events = []
+        for event in events:
+            start = event['start'].get('dateTime', event['start'].get('date'))
+            formatted_events.append({
+                "id": event['id'],
+                "summary": event.get('summary', 'No title'),
+                "start": start,
+                "description": event.get('description', '')[:100] if event.get('description') else ''
+            })
+        
+        return to_json({
+            "found": len(formatted_events),
+            "events": formatted_events
+        })
+    
+    def _tool_delete_event(self, tool_input: dict) -> str:
+        """Handle the delete_event tool."""
+        event_id = tool_input["event_id"]
+        event_summary = tool_input.get("event_summary", "Unknown event")
+        
+        print(f"DEBUG: Deleting event '{event_summary}' (ID: {event_id})")
+        
+        success = self.google.delete_event(event_id)
+        
+        if success:
+            return to_json({
+                "success": True,
+                "message": f"Successfully deleted event: {event_summary}"
+            })
+        else:
+            return to_json({
+                "success": False,
+                "message": f"Failed to delete event: {event_summary}. It may have already been deleted or the ID is invalid."
+            })
+    
+    def _tool_get_new_emails_since_login(self, tool_input: dict) -> str:
+        """Handle the get_new_emails_since_login tool."""
+        max_results = min(tool_input.get("max_results", 20), MAX_TOOL_EMAILS)
+        
+        # Use previous_login if available (before this session), otherwise use last_login
+        since_date = getattr(self, 'previous_login', None) or self.last_login
+        
+        if since_date is None:
+            # If no previous login, get emails from last 24 hours
+            since_date = datetime.now(self.tz) - timedelta(days=1)
+        
+        emails = self.google.get_emails_since(
+            since_date=since_date,
+            max_results=max_results,
+            exclude_promotional=True,
+            exclusion_domains=self.exclusion_domains,
+            since_history_id=getattr(self, 'previous_history_id', None)
+        )
+        
+        return to_json({
+            "count": len(emails),
+            "since": since_date.isoformat(),
+            "emails": emails
+        })
+    
+    def _tool_add_exclusion_domain(self, tool_input: dict) -> str:
+        """Handle the add_exclusion_domain tool."""
+        domain = tool_input["domain"]
+        success = self.add_exclusion_domain(domain)
+        
+        if success:
+            return to_json({
+                "success": True,
+                "message": f"Added '{domain}' to exclusion list",
+                "excluded_domains": self.get_exclusion_domains()
+            })
+        else:
+            return to_json({
+                "success": False,
+                "message": f"Domain '{domain}' is already in exclusion list or invalid"
+            })
+    
+    def _tool_remove_exclusion_domain(self, tool_input: dict) -> str:
+        """Handle the remove_exclusion_domain tool."""
+        domain = tool_input["domain"]
+        success = self.remove_exclusion_domain(domain)
+        
+        if success:
+            return to_json({
+                "success": True,
+                "message": f"Removed '{domain}' from exclusion list",
+                "excluded_domains": self.get_exclusion_domains()
+            })
+        else:
+            return to_json({
+                "success": False,
+                "message": f"Domain '{domain}' not found in exclusion list"
+            })
+    
+    def _tool_get_exclusion_domains(self, tool_input: dict) -> str:
+        """Handle the get_exclusion_domains tool."""
+        domains = self.get_exclusion_domains()
+        return to_json({
+            "count": len(domains),
+            "domains": domains
+        })
+    
+    def _history_to_text(self, messages: list) -> str:
+        """Render history messages as a plain-text transcript for summarization."""
+        lines = []
+        for msg in messages:
+            content = msg['content']
+            if isinstance(content, str):
+                lines.append(f"{msg['role'].title()}: {content}")
+                continue
+            for block in content:
+                if isinstance(block, dict):
+                    if block.get('type') == 'tool_use':
+                        lines.append(f"Assistant called {block.get('name')} with {to_json(block.get('input'))}")
+                    elif block.get('type') == 'tool_result':
+                        lines.append(f"Tool result: {str(block.get('content', ''))[:300]}")
+                elif getattr(block, 'type', None) == 'text':
+                    lines.append(f"Assistant: {block.text}")
+                elif getattr(block, 'type', None) == 'tool_use':
+                    lines.append(f"Assistant called {block.name} with {to_json(block.input)}")
+        return '\n'.join(lines)
+    
+    def _summarize_history(self, messages: list):
+        """Fold dropped history messages into the running conversation summary."""
+        transcript = self._history_to_text(messages)
+        if self.conversation_summary:
+            transcript = f"Summary so far: {self.conversation_summary}\n\n{transcript}"
+        
+        try:
+            response = self.llm.create_message(
+                messages=[{"role": "user", "content": transcript}],
+                system_prompt=(
+                    "Summarize this conversation between a user and their executive assistant "
+                    "in a few sentences. Keep names, dates, times, event IDs, decisions and "
+                    "any requests that are still pending."
+                ),
+                max_tokens=400
+            )
+            self.conversation_summary = self.llm.extract_text_from_response(response).strip()
         except Exception as e:
-            return json.dumps({"error": str(e)})
+            print(f"Warning: Could not summarize conversation history: {e}")
+    
+    def _wait_for_summary(self):
+        """Wait for a background history summary to finish updating conversation_summary."""
+        if self._pending_summary is not None:
+            self._pending_summary.result()
+            self._pending_summary = None
+    
+    def _compact_history(self):
+        """Keep conversation_history bounded so each request doesn't resend every turn."""
+        # A turn starts at a plain user message; cutting only there never
+        # separates a tool_use from its tool_result
+        turn_starts = [
+            i for i, msg in enumerate(self.conversation_history)
+            if msg['role'] == 'user' and isinstance(msg['content'], str)
+        ]
+        
+        # Characters from each message to the end of the history
+        history_len = len(self.conversation_history)
+        suffix_chars = [0] * (history_len + 1)
+        for i in range(history_len - 1, -1, -1):
+            suffix_chars[i] = suffix_chars[i + 1] + message_chars(self.conversation_history[i])
+        
+        over_limit = history_len > MAX_HISTORY_MESSAGES or suffix_chars[0] > MAX_HISTORY_CHARS
+        if over_limit and turn_starts:
+            cut = next(
+                (i for i in turn_starts
+                 if history_len - i <= KEEP_HISTORY_MESSAGES and suffix_chars[i] <= KEEP_HISTORY_CHARS),
+                turn_starts[-1]
+            )
+            if cut > 0:
+                dropped = self.conversation_history[:cut]
+                del self.conversation_history[:cut]
+                # Summarize off the response path; the next turn waits for it
+                self._pending_summary = TOOL_EXECUTOR.submit(self._summarize_history, dropped)
+                turn_starts = [i - cut for i in turn_starts if i >= cut]
+        
+        # Large tool results older than the last two turns are rarely needed verbatim
+        if len(turn_starts) > 2:
+            for msg in self.conversation_history[:turn_starts[-2]]:
+                if msg['role'] != 'user' or isinstance(msg['content'], str):
+                    continue
+                msg['content'] = [
+                    {**block, 'content': '[Earlier tool result omitted - call the tool again if needed]'}
+                    if isinstance(block, dict) and block.get('type') == 'tool_result'
+                    and len(str(block.get('content', ''))) > STALE_TOOL_RESULT_CHARS
+                    else block
+                    for block in msg['content']
+                ]
     
     def chat(self, user_message: str) -> str:
         """Process a user message and return a response."""
+        turn = self._converse(user_message, stream=False)
+        while True:
+            try:
+                next(turn)
+            except StopIteration as done:
+                return done.value
+    
+    def chat_stream(self, user_message: str) -> Iterator[dict]:
+        """
+        Process a user message, yielding events as the response is generated.
+        
+        Yields:
+            {'type': 'text', 'text': str} for each chunk of generated text, and
+            {'type': 'tool', 'name': str} before each tool is executed
+        """
+        yield from self._converse(user_message, stream=True)
+    
+    def _create_response(self, system_context: str, stream: bool) -> Generator[dict, None, object]:
+        """Request the next LLM response, yielding text events as they arrive when streaming."""
+        kwargs = {
+            'messages': self.conversation_history,
+            'system_prompt': SYSTEM_PROMPT,
+            'system_context': system_context,
+            'tools': TOOLS,
+            'max_tokens': 4096
+        }
+        if not stream:
+            return self.llm.create_message(**kwargs)
+        
+        chunks = self.llm.stream_message(**kwargs)
+        while True:
+            try:
+                text = next(chunks)
+            except StopIteration as done:
+                return done.value
+            yield {'type': 'text', 'text': text}
+    
+    def _converse(self, user_message: str, stream: bool) -> Generator[dict, None, str]:
+        """Run the agent loop for one user message; returns the final response text."""
         self.conversation_history.append({
             "role": "user",
             "content": user_message
         })
         
-        time_context = self._get_current_time_context()
+        # The stable instructions are cached by providers that support it; the
+        # time context and summary change per request, so they are sent after them
+        self._wait_for_summary()
+        system_context = self._get_current_time_context()
+        if self.conversation_summary:
+            system_context += f"\n\nSummary of the earlier conversation:\n{self.conversation_summary}"
         
-        system_prompt = f"""You are an executive assistant with access to the user's Gmail and Google Calendar.
-Your job is to help manage their schedule efficiently.
-
-{time_context}
-
-CRITICAL DATE HANDLING:
-- Use the reference dates above to determine the correct date for any day mentioned
-- "This Thursday" means the Thursday shown in the reference dates above
-- Always use ISO format with timezone offset: YYYY-MM-DDTHH:MM:SS-05:00 (for EST) or -04:00 (for EDT)
-- Currently we are in EST (Eastern Standard Time), so use -05:00
-- Double-check the date before creating any event
-
-Key responsibilities:
-1. Schedule events based on natural language requests
-2. Find free times when asked
-3. Check emails for scheduling requests and suggest times
-4. ALWAYS flag conflicts with important events (interviews, deadlines, presentations)
-5. Suggest alternative times when conflicts exist
-6. Delete events when requested
-7. Provide email updates since last login (automatically on startup)
-8. Manage exclusion list for filtering promotional emails
-
-DELETING EVENTS:
-- When the user asks to delete/remove/cancel an event, first use find_event to search for it
-- If multiple events match, list them and ask the user to confirm which one to delete
-- Always confirm the event details (name and date/time) before deleting
-- Use the event ID from find_event to delete the correct event
-
-Priority keywords to watch for: {', '.join(PRIORITY_KEYWORDS)}
-
-When creating events:
-1. First, determine the correct date using the reference dates provided
-2. Check for conflicts
-3. Create the event with the EXACT date from the reference
-4. Confirm the day and date with the user in your response"""
-
         # Initial API call
-        tools = self._build_tools()
-        response = self.llm.create_message(
-            messages=self.conversation_history,
-            system_prompt=system_prompt,
-            tools=tools if tools else None,
-            max_tokens=4096
-        )
+        response = yield from self._create_response(system_context, stream)
         
         # Handle tool use in a loop
         stop_reason = self.llm.get_stop_reason(response)
@@ -647,9 +940,30 @@ When creating events:
             assistant_response_content = response.content if hasattr(response, 'content') else None
             
             for tool_call in tool_uses:
+                # Announced before printing, so a streaming caller can finish its line first
+                yield {'type': 'tool', 'name': tool_call['name']}
                 print(f"DEBUG: Tool called: {tool_call['name']}")
                 print(f"DEBUG: Tool input: {json.dumps(tool_call['input'], indent=2)}")
-                result = self._execute_tool(tool_call['name'], tool_call['input'])
+            
+            # Identical calls in one response (same tool and input) are only executed once
+            call_keys = [(tc['name'], to_json(tc['input'])) for tc in tool_uses]
+            unique_calls = list(dict(zip(call_keys, tool_uses)).items())
+            
+            if len(unique_calls) == 1:
+                tool_call = unique_calls[0][1]
+                unique_results = [self._execute_tool(tool_call['name'], tool_call['input'])]
+            else:
+                # Tools are independent, I/O-bound API calls - run them concurrently
+                unique_results = list(TOOL_EXECUTOR.map(
+                    self._execute_tool,
+                    [tc['name'] for _, tc in unique_calls],
+                    [tc['input'] for _, tc in unique_calls]
+                ))
+            
+            results_by_key = {key: result for (key, _), result in zip(unique_calls, unique_results)}
+            results = [results_by_key[key] for key in call_keys]
+            
+            for tool_call, result in zip(tool_uses, results):
                 tool_results.append({
                     "type": "tool_result",
                     "tool_use_id": tool_call.get('id', ''),
@@ -676,12 +990,7 @@ When creating events:
             })
             
             # Get next response
-            response = self.llm.create_message(
-                messages=self.conversation_history,
-                system_prompt=system_prompt,
-                tools=tools if tools else None,
-                max_tokens=4096
-            )
+            response = yield from self._create_response(system_context, stream)
             stop_reason = self.llm.get_stop_reason(response)
         
         # Extract final text response
@@ -699,6 +1008,7 @@ When creating events:
                 "content": final_response
             })
         
+        self._compact_history()
         return final_response
 
 
@@ -715,8 +1025,7 @@ def main():
         assistant = ExecutiveAssistant(llm_provider=llm_provider)
         
         # Show current time for verification
-        tz = ZoneInfo(DEFAULT_TIMEZONE)
-        now = datetime.now(tz)
+        now = datetime.now(DEFAULT_TZ)
         print(f"✅ Connected to Gmail and Calendar")
         provider_name = os.getenv('LLM_PROVIDER', 'claude').upper()
         print(f"✅ Connected to {provider_name} API")
@@ -728,6 +1037,8 @@ def main():
             time_since = now - assistant.previous_login
             if time_since.total_seconds() > 60:  # Only show if more than 1 minute since last login
                 print("\n📧 Checking for new emails since last login...")
+                # Warm the email cache while the model decides to call the tool for it
+                TOOL_EXECUTOR.submit(assistant._tool_get_new_emails_since_login, {})
                 try:
                     email_response = assistant.chat("Show me new emails since I last logged in. Only show emails from my primary mailbox, excluding promotional and marketing emails.")
                     print(f"\n{email_response}\n")
@@ -765,13 +1076,26 @@ def main():
                 break
             
             if user_input.lower() == 'clear':
-                assistant.conversation_history = []
+                assistant._wait_for_summary()
+                assistant.conversation_history.clear()
+                assistant.conversation_summary = ''
                 print("✅ Conversation cleared.\n")
                 continue
             
             print("\nThinking...\n")
-            response = assistant.chat(user_input)
-            print(f"Assistant: {response}\n")
+            # Print the reply as it is generated rather than after the whole turn; the
+            # prefix waits for the first text so tool output never lands inside the line
+            in_reply = False
+            for event in assistant.chat_stream(user_input):
+                if event['type'] == 'text':
+                    if not in_reply:
+                        print("Assistant: ", end='', flush=True)
+                        in_reply = True
+                    print(event['text'], end='', flush=True)
+                elif in_reply:
+                    print()
+                    in_reply = False
+            print("\n")
     
     except ValueError as e:
         print(f"❌ Configuration Error: {e}")
@@ -3,6 +3,8 @@
 Background service that monitors for scheduling conflicts and sends notifications.
 Run this separately from the main assistant.
 """
+import os
+import re
 import time
 import schedule
 from datetime import datetime, timedelta
@@ -21,10 +23,61 @@ PRIORITY_KEYWORDS = [
     'board meeting', 'final', 'urgent', 'important'
 ]
 
+# Match all keywords in one pass over the summary
+PRIORITY_RE = re.compile('|'.join(map(re.escape, PRIORITY_KEYWORDS)))
+
+# Notified event IDs are remembered across restarts for this long
+NOTIFIED_EVENTS_FILE = 'notified_events.log'
+NOTIFIED_EVENTS_TTL_SECONDS = 48 * 3600
+
+
 class BackgroundMonitor:
     def __init__(self):
         self.google = GoogleServices()
-        self.notified_events = set()
+        self.notified_events = {}  # event ID -> time notified
+        self._load_notified_events()
+    
+    def _load_notified_events(self):
+        """Load recently notified event IDs and compact the log."""
+        if not os.path.exists(NOTIFIED_EVENTS_FILE):
+            return
+        cutoff = time.time() - NOTIFIED_EVENTS_TTL_SECONDS
+        try:
+            with open(NOTIFIED_EVENTS_FILE) as f:
+                for line in f:
+                    event_id, _, notified_at = line.rstrip('\n').partition('\t')
+                    try:
+                        notified_at = float(notified_at)
+                    except ValueError:
+                        continue  # truncated or garbled line; dropped by the rewrite below
+                    if event_id and notified_at > cutoff:
+                        # Re-notified IDs move to the end, keeping entries in notification order
+                        self.notified_events.pop(event_id, None)
+                        self.notified_events[event_id] = notified_at
+            with open(NOTIFIED_EVENTS_FILE, 'w') as f:
+                f.writelines(f"{event_id}\t{notified_at}\n"
+                             for event_id, notified_at in self.notified_events.items())
+        except OSError as e:
+            print(f"Warning: Could not load notified events: {e}")
+    
+    def _mark_notified(self, event_id: str):
+        """Remember an event ID, dropping expired ones, and append it to the log."""
+        now = time.time()
+        cutoff = now - NOTIFIED_EVENTS_TTL_SECONDS
+        # Entries are in notification order, so expired ones are at the front
+        while self.notified_events:
+            old_id, notified_at = next(iter(self.notified_events.items()))
+            if notified_at > cutoff:
+                break
+            del self.notified_events[old_id]
+        # Re-insert rather than update, so the newest entry is last
+        self.notified_events.pop(event_id, None)
+        self.notified_events[event_id] = now
+        try:
+            with open(NOTIFIED_EVENTS_FILE, 'a') as f:
+                f.write(f"{event_id}\t{now}\n")
+        except OSError as e:
+            print(f"Warning: Could not save notified event: {e}")
     
     def send_notification(self, title: str, message: str):
         """Send a desktop notification."""
@@ -39,26 +92,24 @@ class BackgroundMonitor:
     
     def check_upcoming_priority_events(self):
         """Check for priority events in the next 24 hours."""
-        events = self.google.get_events(days_ahead=1)
+        events = self.google.get_events(days_ahead=1, fields='etag,items(id,summary,start)')
         
         for event in events:
             event_id = event.get('id')
             summary = event.get('summary', '').lower()
             
             # Check if it's a priority event
-            is_priority = any(keyword in summary for keyword in PRIORITY_KEYWORDS)
-            
-            if is_priority and event_id not in self.notified_events:
+            if event_id not in self.notified_events and PRIORITY_RE.search(summary):
                 start = event['start'].get('dateTime', event['start'].get('date'))
                 self.send_notification(
                     "⚠️ Important Event Coming Up",
                     f"{event.get('summary')} at {start}"
                 )
-                self.notified_events.add(event_id)
+                self._mark_notified(event_id)
     
     def check_daily_summary(self):
         """Send a daily summary of events."""
-        events = self.google.get_events(days_ahead=1)
+        events = self.google.get_events(days_ahead=1, fields='etag,items(id,summary,start)')
         
         if events:
             summary = f"You have {len(events)} events today:\n"
@@ -72,18 +123,27 @@ class BackgroundMonitor:
         """Start the background monitor."""
         print("🔄 Background monitor started...")
         
-        # Check for priority events every 30 minutes
-        schedule.every(30).minutes.do(self.check_upcoming_priority_events)
+        # Check for priority events every 30-31 minutes (jittered so runs don't align)
+        schedule.every(30).to(31).minutes.do(self._run_check, self.check_upcoming_priority_events)
         
         # Daily summary at 8 AM
-        schedule.every().day.at("08:00").do(self.check_daily_summary)
+        schedule.every().day.at("08:00").do(self._run_check, self.check_daily_summary)
         
         # Initial check
-        self.check_upcoming_priority_events()
+        self._run_check(self.check_upcoming_priority_events)
         
         while True:
             schedule.run_pending()
-            time.sleep(60)
+            # Sleep until the next job is due instead of waking every minute
+            idle_seconds = schedule.idle_seconds()
+            time.sleep(max(idle_seconds, 1) if idle_seconds is not None else 60)
+    
+    def _run_check(self, check):
+        """Run a scheduled check; API errors are logged and retried at the next run."""
+        try:
+            check()
+        except Exception as e:
+            print(f"Warning: {check.__name__} failed: {e}")
 
 
 if __name__ == "__main__":
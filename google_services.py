@@ -3,14 +3,30 @@ import os
 import base64
 import re
 import email.utils
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Optional, List
+from operator import itemgetter
+from typing import Iterable, Optional, List
 from zoneinfo import ZoneInfo
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+import google_auth_httplib2
+import httplib2
+
+# Use ciso8601's C parser for API timestamps if it is installed
+try:
+    import ciso8601
+    HAS_CISO8601 = True
+except ImportError:
+    HAS_CISO8601 = False
 
 SCOPES = [
     'https://www.googleapis.com/auth/gmail.readonly',
@@ -20,17 +36,124 @@ SCOPES = [
 
 # Default timezone - Eastern Time (handles EST/EDT automatically)
 DEFAULT_TIMEZONE = 'America/New_York'
+DEFAULT_TZ = ZoneInfo(DEFAULT_TIMEZONE)
+
+# Calendar/Gmail responses are served from memory for CACHE_TTL_SECONDS, then
+# revalidated with If-None-Match until CACHE_MAX_AGE_SECONDS (event lists are
+# fetched that far past their window, so the drifting window stays covered)
+CACHE_TTL_SECONDS = 60
+CACHE_MAX_AGE_SECONDS = 600
+
+# Gmail recommends at most 50 requests per batch to avoid rate limiting
+GMAIL_BATCH_SIZE = 50
+# Per-message metadata/bodies kept in memory
+MESSAGE_CACHE_SIZE = 512
+
+# Event fields any caller reads (shown to the user/LLM or used for matching and
+# overlap checks) - requested instead of the full resource by default
+EVENT_FIELDS = 'items(id,summary,start,end,location,description,htmlLink,status,organizer,attendees)'
+CONFLICT_MAX_RESULTS = 50
+
+# Gmail category labels excluded along with the matching -category: search terms
+PROMOTIONAL_CATEGORY_LABELS = frozenset({'CATEGORY_PROMOTIONS', 'CATEGORY_SOCIAL', 'CATEGORY_UPDATES'})
+
+# Common promotional indicators in the subject/snippet (matched as substrings)
+PROMOTIONAL_KEYWORDS = [
+    'unsubscribe', 'marketing', 'promotion', 'special offer', 'limited time',
+    'act now', 'buy now', 'discount', 'sale', 'deal', 'coupon', 'newsletter',
+    'sponsored', 'advertisement', 'ad', 'promo code', 'exclusive offer'
+]
+
+# Match all keywords in one pass over the text
+PROMOTIONAL_KEYWORDS_RE = re.compile('|'.join(map(re.escape, PROMOTIONAL_KEYWORDS)))
+
+# Common promotional sender mailboxes (checked against the lowercased From header)
+PROMOTIONAL_SENDER_RE = re.compile(r'(?:noreply|no-reply|donotreply|newsletter|marketing|promo|sales|offers)@')
+
+# An address inside "Name <email@domain.com>" or a bare "email@domain.com"
+EMAIL_ADDRESS_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+
+# A bare lowercase domain name; exclusion entries that aren't one are matched as substrings of From
+DOMAIN_RE = re.compile(r'(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z]{2,}')
+
+# Day/month names for hand-formatting free slots (avoids strftime's locale machinery)
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+MONTH_ABBREVIATIONS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                       'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
 
 
+def get_header(headers: list, name: str) -> str:
+    """Return the value of a message header from the Gmail payload header list."""
+    return next((h['value'] for h in headers if h['name'] == name), '')
+
+
+def format_clock_time(dt: datetime) -> str:
+    """Format as '08:30 PM' (same as strftime('%I:%M %p'))."""
+    return f"{dt.hour % 12 or 12:02d}:{dt.minute:02d} {'AM' if dt.hour < 12 else 'PM'}"
+
+
+def format_slot_display(start: datetime, end: datetime) -> str:
+    """Format as 'Monday Jan 05, 09:00 AM - 10:00 AM ET' (same as the strftime formats it replaces)."""
+    return (f"{DAY_NAMES[start.weekday()]} {MONTH_ABBREVIATIONS[start.month - 1]} {start.day:02d}, "
+            f"{format_clock_time(start)} - {format_clock_time(end)} ET")
+
+
+def normalize_exclusion_domain(entry: str) -> str:
+    """Reduce an exclusion entry (domain, URL or email address) to its lowercase domain."""
+    entry = entry.strip().lower()
+    entry = entry.split('://', 1)[-1]   # scheme
+    entry = entry.split('/', 1)[0]      # path
+    entry = entry.rsplit('@', 1)[-1]    # mailbox of an address
+    if entry.startswith('www.'):
+        entry = entry[4:]
+    return entry
+
+
+@lru_cache(maxsize=1024)
+def parse_datetime(dt_string: str, tz: ZoneInfo) -> datetime:
+    """Parse an API datetime string into tz (cached - the same event times recur across calls)."""
+    try:
+        if HAS_CISO8601:
+            dt = ciso8601.parse_datetime(dt_string)
+        else:
+            # 'Z' is spelled out for Python < 3.11
+            dt = datetime.fromisoformat(dt_string.replace('Z', '+00:00'))
+    except ValueError:
+        # Fallback parsing
+        dt = datetime.fromisoformat(dt_string.split('.')[0])
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=tz)
+    return dt.astimezone(tz)
+
 class GoogleServices:
     def __init__(self, credentials_path: str = 'credentials.json', token_path: str = 'token.json'):
         self.credentials_path = credentials_path
         self.token_path = token_path
         self.creds = None
-        self.tz = ZoneInfo(DEFAULT_TIMEZONE)
+        self.tz = DEFAULT_TZ
+        self._local = threading.local()
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        # Message metadata and bodies don't change once received, so they are kept by ID (LRU)
+        self._message_cache = OrderedDict()
+        self._message_cache_lock = threading.Lock()
+        self._user_email = ''  # fixed for the authenticated account, fetched once
         self._authenticate()
-        self.gmail = build('gmail', 'v1', credentials=self.creds)
-        self.calendar = build('calendar', 'v3', credentials=self.creds)
+        # Both services share this thread's keep-alive connection rather than each wrapping its own
+        self.gmail = build('gmail', 'v1', http=self._thread_http(), requestBuilder=self._build_request)
+        self.calendar = build('calendar', 'v3', http=self._thread_http(), requestBuilder=self._build_request)
+    
+    def _thread_http(self) -> google_auth_httplib2.AuthorizedHttp:
+        """Get this thread's authorized HTTP connection (httplib2 is not thread-safe)."""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(self.creds, http=httplib2.Http())
+            self._local.http = http
+        return http
+    
+    def _build_request(self, http, *args, **kwargs) -> HttpRequest:
+        """Build API requests on the calling thread's connection so calls can run concurrently."""
+        return HttpRequest(self._thread_http(), *args, **kwargs)
     
     def _authenticate(self):
         """Handle OAuth2 authentication flow."""
@@ -47,77 +170,172 @@ class GoogleServices:
             with open(self.token_path, 'w') as token:
                 token.write(self.creds.to_json())
     
+    def _cache_lookup(self, key: tuple) -> tuple:
+        """Return (fresh payload or None, cache entry or None) for a cache key."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        now = time.monotonic()
+        if entry is None or now - entry['fetched'] >= CACHE_MAX_AGE_SECONDS:
+            return None, None
+        if now - entry['validated'] < CACHE_TTL_SECONDS:
+            return entry['payload'], entry
+        return None, entry
+    
+    def _cache_store(self, key: tuple, payload, etag: Optional[str] = None, window: Optional[tuple] = None):
+        """Store a response and drop entries too old to revalidate."""
+        now = time.monotonic()
+        with self._cache_lock:
+            for old_key in [k for k, e in self._cache.items() if now - e['fetched'] >= CACHE_MAX_AGE_SECONDS]:
+                del self._cache[old_key]
+            self._cache[key] = {'fetched': now, 'validated': now, 'etag': etag, 'payload': payload, 'window': window}
+    
+    def _cache_revalidated(self, key: tuple, entry: dict):
+        """Mark an entry as confirmed unchanged (304) by storing a copy with a new validated time."""
+        with self._cache_lock:
+            # Entries are replaced rather than mutated, so readers never see one half-updated
+            if self._cache.get(key) is entry:
+                self._cache[key] = dict(entry, validated=time.monotonic())
+    
+    def _invalidate_cache(self, kind: str):
+        """Drop all cached responses of one kind ('events' or 'emails'; 'events' drops free/busy too)."""
+        kinds = (kind, 'freebusy') if kind == 'events' else (kind,)
+        with self._cache_lock:
+            for key in [k for k in self._cache if k[0] in kinds]:
+                del self._cache[key]
+    
     def _ensure_timezone(self, dt: datetime) -> datetime:
         """Ensure a datetime has the default timezone."""
         if dt.tzinfo is None:
             return dt.replace(tzinfo=self.tz)
+        if dt.tzinfo is self.tz:
+            return dt
         return dt.astimezone(self.tz)
     
     def _parse_datetime(self, dt_string: str) -> datetime:
         """Parse a datetime string and ensure it has the correct timezone."""
-        # Handle various formats
-        dt_string = dt_string.replace('Z', '+00:00')
-        
-        try:
-            # Try ISO format first
-            if '+' in dt_string or '-' in dt_string[10:]:
-                dt = datetime.fromisoformat(dt_string)
-            else:
-                dt = datetime.fromisoformat(dt_string)
-                dt = dt.replace(tzinfo=self.tz)
-        except ValueError:
-            # Fallback parsing
-            dt = datetime.fromisoformat(dt_string.split('.')[0])
-            dt = dt.replace(tzinfo=self.tz)
-        
-        return dt.astimezone(self.tz)
+        return parse_datetime(dt_string, self.tz)
     
     # ===== GMAIL METHODS =====
     
+    def _message_cache_get(self, key: tuple):
+        """Look up a cached per-message value, marking it recently used."""
+        with self._message_cache_lock:
+            value = self._message_cache.get(key)
+            if value is not None:
+                self._message_cache.move_to_end(key)
+            return value
+    
+    def _message_cache_put(self, key: tuple, value):
+        """Cache a per-message value, evicting the least recently used beyond the limit."""
+        with self._message_cache_lock:
+            self._message_cache[key] = value
+            self._message_cache.move_to_end(key)
+            while len(self._message_cache) > MESSAGE_CACHE_SIZE:
+                self._message_cache.popitem(last=False)
+    
+    def _get_messages_metadata(self, message_ids: List[str], metadata_headers: List[str],
+                               fields: str) -> dict:
+        """Fetch metadata for many messages with batched requests; returns {id: message}."""
+        results = {}
+        request_key = (tuple(metadata_headers), fields)
+        
+        # Only fetch messages that haven't been seen with the same headers and fields
+        missing_ids = []
+        for message_id in message_ids:
+            cached = self._message_cache_get(('metadata', message_id, request_key))
+            if cached is not None:
+                results[message_id] = cached
+            else:
+                missing_ids.append(message_id)
+        message_ids = missing_ids
+        
+        def collect(request_id, response, exception):
+            if exception is not None:
+                print(f"Warning: Could not fetch email {request_id}: {exception}")
+                return
+            results[request_id] = response
+            self._message_cache_put(('metadata', request_id, request_key), response)
+        
+        for i in range(0, len(message_ids), GMAIL_BATCH_SIZE):
+            batch = self.gmail.new_batch_http_request(callback=collect)
+            for message_id in message_ids[i:i + GMAIL_BATCH_SIZE]:
+                batch.add(
+                    self.gmail.users().messages().get(
+                        userId='me', id=message_id, format='metadata',
+                        metadataHeaders=metadata_headers, fields=fields
+                    ),
+                    request_id=message_id
+                )
+            batch.execute()
+        
+        return results
+    
     def get_recent_emails(self, max_results: int = 20, query: str = '') -> list:
-        """Fetch recent emails, optionally filtered by query."""
+        """Fetch recent emails, optionally filtered by query (cached briefly)."""
+        cache_key = ('emails', 'recent', query, max_results)
+        cached, _ = self._cache_lookup(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         results = self.gmail.users().messages().list(
-            userId='me', maxResults=max_results, q=query
+            userId='me', maxResults=max_results, q=query, fields='messages(id)'
         ).execute()
         
         messages = results.get('messages', [])
+        metadata = self._get_messages_metadata(
+            [msg['id'] for msg in messages],
+            ['From', 'Subject', 'Date'],
+            'snippet,payload/headers'
+        )
         emails = []
         
         for msg in messages:
-            email_data = self.gmail.users().messages().get(
-                userId='me', id=msg['id'], format='metadata',
-                metadataHeaders=['From', 'Subject', 'Date']
-            ).execute()
+            email_data = metadata.get(msg['id'])
+            if email_data is None:
+                continue
             
-            headers = {h['name']: h['value'] for h in email_data['payload']['headers']}
+            headers = email_data['payload']['headers']
             emails.append({
                 'id': msg['id'],
-                'from': headers.get('From', ''),
-                'subject': headers.get('Subject', ''),
-                'date': headers.get('Date', ''),
+                'from': get_header(headers, 'From'),
+                'subject': get_header(headers, 'Subject'),
+                'date': get_header(headers, 'Date'),
                 'snippet': email_data.get('snippet', '')
             })
         
-        return emails
+        self._cache_store(cache_key, emails)
+        return list(emails)
     
     def get_email_body(self, email_id: str) -> str:
-        """Get the full body of an email."""
+        """Get the full body of an email, preferring the text/plain part (cached by ID)."""
+        cache_key = ('body', email_id)
+        cached = self._message_cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         msg = self.gmail.users().messages().get(userId='me', id=email_id, format='full').execute()
         
-        def extract_body(payload):
-            if 'body' in payload and payload['body'].get('data'):
-                return base64.urlsafe_b64decode(payload['body']['data']).decode('utf-8')
-            if 'parts' in payload:
-                for part in payload['parts']:
-                    if part['mimeType'] == 'text/plain':
-                        if part['body'].get('data'):
-                            return base64.urlsafe_b64decode(part['body']['data']).decode('utf-8')
-                    result = extract_body(part)
-                    if result:
-                        return result
-            return ''
-        
-        return extract_body(msg['payload'])
+        # Breadth-first over the MIME tree: stop at the first text/plain part with data,
+        # otherwise fall back to the first other text part (e.g. HTML-only mail)
+        body_data = None
+        fallback_data = None
+        parts = deque([msg['payload']])
+        while parts:
+            part = parts.popleft()
+            data = part.get('body', {}).get('data')
+            mime_type = part.get('mimeType', '')
+            if data:
+                if mime_type.startswith('text/plain'):
+                    body_data = data
+                    break
+                if fallback_data is None and mime_type.startswith('text/'):
+                    fallback_data = data
+            parts.extend(part.get('parts', ()))
+        
+        body_data = body_data or fallback_data
+        body = base64.urlsafe_b64decode(body_data).decode('utf-8', 'replace') if body_data else ''
+        self._message_cache_put(cache_key, body)
+        return body
     
     def send_email(self, to: str, subject: str, body: str, 
                    cc: Optional[str] = None, bcc: Optional[str] = None) -> dict:
@@ -174,41 +392,39 @@ class GoogleServices:
                 'message': f'Failed to send email: {str(e)}'
             }
     
-    def _is_promotional_email(self, email_data: dict, exclusion_domains: List[str] = None) -> bool:
-        """Check if an email is promotional/marketing based on various signals."""
-        if exclusion_domains is None:
-            exclusion_domains = []
+    def _is_promotional_email(self, email_data: dict, exclusion_domains: Optional[frozenset] = None,
+                              exclusion_patterns: Iterable[str] = ()) -> bool:
+        """
+        Check if an email is promotional/marketing based on various signals.
         
+        exclusion_domains are matched against the sender domain and its parent domains;
+        exclusion_patterns (entries that aren't bare domains) anywhere in the From header.
+        """
         from_addr = email_data.get('from', '').lower()
         subject = email_data.get('subject', '').lower()
         snippet = email_data.get('snippet', '').lower()
         
-        # Check exclusion domains
-        for domain in exclusion_domains:
-            if domain.lower() in from_addr:
+        # Check the sender domain and each parent domain (news.example.com, example.com, ...)
+        # against the lowercased exclusion set: one hashed lookup per label instead of a
+        # scan over every excluded domain
+        if exclusion_domains:
+            sender_domain = email_data.get('domain') or self._extract_domain_from_email(from_addr)
+            labels = sender_domain.split('.')
+            for i in range(len(labels)):
+                if '.'.join(labels[i:]) in exclusion_domains:
+                    return True
+        for pattern in exclusion_patterns:
+            if pattern in from_addr:
                 return True
         
-        # Common promotional indicators
-        promotional_keywords = [
-            'unsubscribe', 'marketing', 'promotion', 'special offer', 'limited time',
-            'act now', 'buy now', 'discount', 'sale', 'deal', 'coupon', 'newsletter',
-            'sponsored', 'advertisement', 'ad', 'promo code', 'exclusive offer'
-        ]
-        
         # Check subject and snippet for promotional keywords
         text_to_check = f"{subject} {snippet}"
-        if any(keyword in text_to_check for keyword in promotional_keywords):
+        if PROMOTIONAL_KEYWORDS_RE.search(text_to_check):
             return True
         
         # Check for common promotional email patterns
-        promotional_patterns = [
-            r'noreply@', r'no-reply@', r'donotreply@', r'newsletter@',
-            r'marketing@', r'promo@', r'sales@', r'offers@'
-        ]
-        
-        for pattern in promotional_patterns:
-            if re.search(pattern, from_addr):
-                return True
+        if PROMOTIONAL_SENDER_RE.search(from_addr):
+            return True
         
         # Check for list-unsubscribe header (common in marketing emails)
         # This would require getting full email headers, so we'll skip for now
@@ -218,7 +434,7 @@ class GoogleServices:
     def _extract_domain_from_email(self, from_addr: str) -> str:
         """Extract domain from email address."""
         # Extract email from "Name <email@domain.com>" or just "email@domain.com"
-        match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', from_addr)
+        match = EMAIL_ADDRESS_RE.search(from_addr)
         if match:
             email_addr = match.group(0)
             return email_addr.split('@')[1].lower()
@@ -256,17 +472,63 @@ class GoogleServices:
         return False
     
     def get_user_email(self) -> str:
-        """Get the user's email address."""
+        """Get the user's email address (fetched once per session)."""
+        if self._user_email:
+            return self._user_email
         try:
-            profile = self.gmail.users().getProfile(userId='me').execute()
-            return profile.get('emailAddress', '')
+            profile = self.gmail.users().getProfile(userId='me', fields='emailAddress').execute()
+            self._user_email = profile.get('emailAddress', '')
         except Exception:
-            return ''
+            pass
+        return self._user_email
+    
+    def get_history_id(self) -> Optional[str]:
+        """Get the mailbox's current history ID (a cursor for incremental sync)."""
+        try:
+            # The same call returns the address, so later get_user_email() calls are free
+            profile = self.gmail.users().getProfile(userId='me', fields='emailAddress,historyId').execute()
+            self._user_email = profile.get('emailAddress', self._user_email)
+            return profile.get('historyId')
+        except Exception as e:
+            print(f"Warning: Could not get Gmail history ID: {e}")
+            return None
+    
+    def _get_added_message_ids(self, start_history_id: str, max_results: int) -> Optional[List[str]]:
+        """Get IDs of inbox messages added since a history ID, newest first (None if the ID expired)."""
+        message_ids = []
+        page_token = None
+        while True:
+            try:
+                response = self.gmail.users().history().list(
+                    userId='me',
+                    startHistoryId=start_history_id,
+                    historyTypes='messageAdded',
+                    labelId='INBOX',
+                    pageToken=page_token,
+                    fields='history(messagesAdded/message/id),nextPageToken'
+                ).execute()
+            except HttpError as e:
+                # Gmail only keeps about a week of history; older IDs return 404
+                if e.resp.status == 404:
+                    return None
+                raise
+            
+            for record in response.get('history', []):
+                for added in record.get('messagesAdded', []):
+                    message_ids.append(added['message']['id'])
+            
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+        
+        # History is oldest first
+        return list(dict.fromkeys(reversed(message_ids)))[:max_results]
     
     def get_emails_since(self, since_date: datetime, max_results: int = 50, 
                         exclude_promotional: bool = True, 
-                        exclusion_domains: List[str] = None,
-                        inbound_only: bool = True) -> list:
+                        exclusion_domains: Optional[Iterable[str]] = None,
+                        inbound_only: bool = True,
+                        since_history_id: Optional[str] = None) -> list:
         """
         Get emails since a specific date, optionally filtering out promotional emails.
         
@@ -274,8 +536,11 @@ class GoogleServices:
             since_date: Date to get emails since
             max_results: Maximum number of emails to return
             exclude_promotional: Whether to exclude promotional emails
-            exclusion_domains: List of domains to exclude
+            exclusion_domains: Domains to exclude (subdomains are excluded too); entries that
+                aren't bare domains after normalize_exclusion_domain() match anywhere in From
             inbound_only: Only return inbound (received) emails, exclude sent emails
+            since_history_id: History ID recorded at since_date; when still valid, only the
+                inbox messages added after it are fetched instead of searching by date
         """
         since_date = self._ensure_timezone(since_date)
         
@@ -293,22 +558,53 @@ class GoogleServices:
         if exclude_promotional:
             query += ' -category:promotions -category:social -category:updates'
         
-        results = self.gmail.users().messages().list(
-            userId='me', 
-            maxResults=max_results, 
-            q=query
-        ).execute()
+        exclusion_domains = frozenset(filter(None, map(normalize_exclusion_domain, exclusion_domains or ())))
+        exclusion_patterns = [entry for entry in exclusion_domains if not DOMAIN_RE.fullmatch(entry)]
+        
+        # Let the search drop excluded senders too, so they don't use up max_results
+        # (history results aren't searched, so the domain check below stays). Only bare
+        # domains go into the query; anything else could add search operators of its own
+        if exclude_promotional and exclusion_domains:
+            query += ''.join(f' -from:{domain}' for domain in sorted(exclusion_domains)
+                             if DOMAIN_RE.fullmatch(domain))
+        
+        cache_key = ('emails', query, max_results, exclude_promotional,
+                     exclusion_domains, inbound_only, since_history_id)
+        cached, _ = self._cache_lookup(cache_key)
+        if cached is not None:
+            return list(cached)
+        
+        message_ids = None
+        if since_history_id:
+            message_ids = self._get_added_message_ids(since_history_id, max_results)
+        if message_ids is None:
+            results = self.gmail.users().messages().list(
+                userId='me', 
+                maxResults=max_results, 
+                q=query,
+                fields='messages(id)'
+            ).execute()
+            message_ids = [msg['id'] for msg in results.get('messages', [])]
         
-        messages = results.get('messages', [])
+        metadata = self._get_messages_metadata(
+            message_ids,
+            ['From', 'Subject', 'Date', 'List-Unsubscribe'],
+            'labelIds,snippet,payload/headers'
+        )
         emails = []
+        user_email = self.get_user_email().lower() if inbound_only else ''
         
-        for msg in messages:
-            email_data = self.gmail.users().messages().get(
-                userId='me', id=msg['id'], format='metadata',
-                metadataHeaders=['From', 'Subject', 'Date', 'List-Unsubscribe']
-            ).execute()
+        for message_id in message_ids:
+            email_data = metadata.get(message_id)
+            if email_data is None:
+                continue
             
-            headers = {h['name']: h['value'] for h in email_data['payload']['headers']}
+            headers = email_data['payload']['headers']
+            from_addr = get_header(headers, 'From')
+            
+            # History results aren't filtered by the search query, so check the category labels too
+            if exclude_promotional and PROMOTIONAL_CATEGORY_LABELS.intersection(email_data.get('labelIds', [])):
+                continue
             
             # Additional check: ensure this is not a sent email
             if inbound_only:
@@ -318,23 +614,21 @@ class GoogleServices:
                     continue
                 
                 # Double-check: if From header contains user's email, skip
-                from_addr = headers.get('From', '')
-                user_email = self.get_user_email()
-                if user_email and user_email.lower() in from_addr.lower():
+                if user_email and user_email in from_addr.lower():
                     continue
             
             email_info = {
-                'id': msg['id'],
-                'from': headers.get('From', ''),
-                'subject': headers.get('Subject', ''),
-                'date': headers.get('Date', ''),
+                'id': message_id,
+                'from': from_addr,
+                'subject': get_header(headers, 'Subject'),
+                'date': get_header(headers, 'Date'),
                 'snippet': email_data.get('snippet', ''),
-                'domain': self._extract_domain_from_email(headers.get('From', ''))
+                'domain': self._extract_domain_from_email(from_addr)
             }
             
             # Additional filtering for promotional emails
             if exclude_promotional:
-                if self._is_promotional_email(email_info, exclusion_domains):
+                if self._is_promotional_email(email_info, exclusion_domains, exclusion_patterns):
                     continue
             
             # Check if email requires a response
@@ -342,39 +636,99 @@ class GoogleServices:
             
             # Parse date for better formatting
             try:
-                parsed_date = email.utils.parsedate_to_datetime(headers.get('Date', ''))
+                parsed_date = email.utils.parsedate_to_datetime(email_info['date'])
                 email_info['parsed_date'] = parsed_date.isoformat() if parsed_date else None
             except:
                 email_info['parsed_date'] = None
             
             emails.append(email_info)
         
-        return emails
+        self._cache_store(cache_key, emails)
+        return list(emails)
     
     # ===== CALENDAR METHODS =====
     
-    def get_events(self, days_ahead: int = 7, calendar_id: str = 'primary') -> list:
-        """Get calendar events for the next N days."""
+    def get_events(self, days_ahead: int = 7, calendar_id: str = 'primary',
+                   fields: Optional[str] = None) -> list:
+        """
+        Get calendar events for the next N days (cached, revalidated by ETag).
+        
+        Args:
+            days_ahead: Number of days to look ahead
+            calendar_id: Calendar to read from
+            fields: Optional narrower partial-response mask, e.g. 'etag,items(id,summary,start)'
+                (defaults to EVENT_FIELDS)
+        """
         now = datetime.now(self.tz)
-        time_min = now.isoformat()
-        time_max = (now + timedelta(days=days_ahead)).isoformat()
+        window_end = now + timedelta(days=days_ahead)
+        
+        # Cached lists are trimmed to the current window: events end and new ones come into range
+        cache_key = ('events', days_ahead, calendar_id, fields)
+        cached, entry = self._cache_lookup(cache_key)
+        if cached is not None:
+            return self._events_in_window(cached, now, window_end)
+        
+        # Fetch past the window for as long as the list may be revalidated instead of refetched
+        fetch_end = window_end + timedelta(seconds=CACHE_MAX_AGE_SECONDS)
         
-        events_result = self.calendar.events().list(
+        # Always keep the collection etag so the response can be revalidated
+        mask = fields or EVENT_FIELDS
+        if not mask.startswith('etag,'):
+            mask = f'etag,{mask}'
+        
+        request = self.calendar.events().list(
             calendarId=calendar_id,
-            timeMin=time_min,
-            timeMax=time_max,
+            timeMin=now.isoformat(),
+            timeMax=fetch_end.isoformat(),
             singleEvents=True,
             orderBy='startTime',
-            timeZone=DEFAULT_TIMEZONE
-        ).execute()
+            timeZone=DEFAULT_TIMEZONE,
+            fields=mask
+        )
+        if entry and entry['etag']:
+            request.headers['If-None-Match'] = entry['etag']
+        
+        try:
+            events_result = request.execute()
+        except HttpError as e:
+            if e.resp.status != 304:
+                raise
+            # Not modified - keep serving the cached list
+            self._cache_revalidated(cache_key, entry)
+            return self._events_in_window(entry['payload'], now, window_end)
+        
+        items = events_result.get('items', [])
+        self._cache_store(cache_key, items, etag=events_result.get('etag'), window=(now, fetch_end))
+        return self._events_in_window(items, now, window_end)
+    
+    def _events_in_window(self, events: list, start: datetime, end: datetime) -> list:
+        """
+        Keep the events that overlap [start, end), as the API's timeMin/timeMax would.
         
-        return events_result.get('items', [])
+        Lists fetched with a mask that leaves out 'end' are trimmed by start time instead.
+        """
+        in_window = []
+        for event in events:
+            event_start = self._event_edge(event, 'start')
+            event_end = self._event_edge(event, 'end') if 'end' in event else event_start
+            if event_start < end and event_end > start:
+                in_window.append(event)
+        return in_window
     
     def get_free_busy(self, start: datetime, end: datetime) -> list:
-        """Get busy times in a date range."""
+        """Get busy times in a date range (answered from a recent query covering it, if any)."""
         start = self._ensure_timezone(start)
         end = self._ensure_timezone(end)
         
+        # Its own kind (event-list keys have another shape), dropped along with the event lists
+        cache_key = ('freebusy',)
+        cached, entry = self._cache_lookup(cache_key)
+        if cached is not None and entry['window'][0] <= start and end <= entry['window'][1]:
+            return [
+                busy for busy in cached
+                if self._parse_datetime(busy['end']) > start and self._parse_datetime(busy['start']) < end
+            ]
+        
         body = {
             "timeMin": start.isoformat(),
             "timeMax": end.isoformat(),
@@ -382,59 +736,80 @@ class GoogleServices:
             "items": [{"id": "primary"}]
         }
         
-        result = self.calendar.freebusy().query(body=body).execute()
-        return result['calendars']['primary']['busy']
+        result = self.calendar.freebusy().query(body=body, fields='calendars/primary/busy').execute()
+        busy_times = result['calendars']['primary']['busy']
+        self._cache_store(cache_key, busy_times, window=(start, end))
+        return list(busy_times)
     
     def find_free_slots(self, days_ahead: int = 7, slot_duration_minutes: int = 60,
-                        work_start: int = 9, work_end: int = 17) -> list:
-        """Find available time slots in the next N days."""
+                        work_start: int = 9, work_end: int = 17,
+                        max_results: Optional[int] = None) -> list:
+        """Find available time slots in the next N days (stopping after max_results, if given)."""
         now = datetime.now(self.tz)
-        end_date = now + timedelta(days=days_ahead)
+        # Through the end of the last day searched (slots start at tomorrow's work_start once
+        # today's has passed); a whole-day end also lets repeat calls reuse the cached query
+        end_date = (now + timedelta(days=days_ahead + 1)).replace(hour=0, minute=0, second=0, microsecond=0)
         busy_times = self.get_free_busy(now, end_date)
         
-        # Convert busy times to datetime objects in local timezone
+        # Convert busy times to datetime objects in local timezone, sorted by start
         busy_periods = []
         for busy in busy_times:
             busy_start = self._parse_datetime(busy['start'])
             busy_end = self._parse_datetime(busy['end'])
             busy_periods.append((busy_start, busy_end))
+        busy_periods.sort(key=itemgetter(0))
+        
+        duration = timedelta(minutes=slot_duration_minutes)
+        step = timedelta(minutes=30)
+        one_day = timedelta(days=1)
+        # Busy periods before this index end before the current slot (slots only move forward)
+        busy_index = 0
         
         # Find free slots during work hours
         free_slots = []
         current = now.replace(hour=work_start, minute=0, second=0, microsecond=0)
         if current < now:
-            current += timedelta(days=1)
+            current += one_day
         
         for _ in range(days_ahead):
-            day_start = current.replace(hour=work_start)
-            day_end = current.replace(hour=work_end)
-            
             # Skip weekends
             if current.weekday() >= 5:
-                current += timedelta(days=1)
+                current += one_day
                 continue
             
-            slot_start = day_start
-            while slot_start + timedelta(minutes=slot_duration_minutes) <= day_end:
-                slot_end = slot_start + timedelta(minutes=slot_duration_minutes)
+            slot_start = current.replace(hour=work_start)
+            last_slot_start = current.replace(hour=work_end) - duration
+            while slot_start <= last_slot_start:
+                slot_end = slot_start + duration
+                
+                while busy_index < len(busy_periods) and busy_periods[busy_index][1] <= slot_start:
+                    busy_index += 1
                 
-                # Check if slot conflicts with busy periods
-                is_free = True
-                for busy_start, busy_end in busy_periods:
-                    if not (slot_end <= busy_start or slot_start >= busy_end):
-                        is_free = False
+                # Check if slot conflicts with busy periods (only those starting before it ends)
+                conflict_end = None
+                i = busy_index
+                while i < len(busy_periods) and busy_periods[i][0] < slot_end:
+                    if busy_periods[i][1] > slot_start:
+                        conflict_end = busy_periods[i][1]
                         break
+                    i += 1
                 
-                if is_free:
-                    free_slots.append({
-                        'start': slot_start.isoformat(),
-                        'end': slot_end.isoformat(),
-                        'display': f"{slot_start.strftime('%A %b %d, %I:%M %p')} - {slot_end.strftime('%I:%M %p')} ET"
-                    })
+                if conflict_end is not None:
+                    # Jump to the first slot on the 30-minute grid after the busy period
+                    slot_start += step * max(1, -((slot_start - conflict_end) // step))
+                    continue
+                
+                free_slots.append({
+                    'start': slot_start.isoformat(),
+                    'end': slot_end.isoformat(),
+                    'display': format_slot_display(slot_start, slot_end)
+                })
+                if max_results is not None and len(free_slots) >= max_results:
+                    return free_slots
                 
-                slot_start += timedelta(minutes=30)
+                slot_start += step
             
-            current += timedelta(days=1)
+            current += one_day
         
         return free_slots
     
@@ -452,19 +827,60 @@ class GoogleServices:
             'end': {'dateTime': end.isoformat(), 'timeZone': DEFAULT_TIMEZONE},
         }
         
-        return self.calendar.events().insert(calendarId='primary', body=event).execute()
+        created = self.calendar.events().insert(calendarId='primary', body=event).execute()
+        self._invalidate_cache('events')
+        return created
+    
+    def _event_edge(self, event: dict, edge: str) -> datetime:
+        """Return an event's 'start' or 'end' as a datetime, treating all-day dates as local midnight."""
+        value = event.get(edge, {})
+        if 'dateTime' in value:
+            return self._parse_datetime(value['dateTime'])
+        return datetime.fromisoformat(value['date']).replace(tzinfo=self.tz)
+    
+    def _event_bounds(self, event: dict) -> tuple:
+        """Return an event's (start, end) as datetimes."""
+        return self._event_edge(event, 'start'), self._event_edge(event, 'end')
+    
+    def _cached_events_between(self, start: datetime, end: datetime) -> Optional[list]:
+        """Answer a primary-calendar range query from a fresh cached window that covers it, if any."""
+        now = time.monotonic()
+        with self._cache_lock:
+            entries = list(self._cache.items())
+        for key, entry in entries:
+            # Only default-mask event lists are known to carry the end times needed for overlap checks
+            if key[0] != 'events' or key[2] != 'primary' or key[3] is not None or not entry['window']:
+                continue
+            window_start, window_end = entry['window']
+            if now - entry['validated'] >= CACHE_TTL_SECONDS or start < window_start or end > window_end:
+                continue
+            overlapping = []
+            for event in entry['payload']:
+                event_start, event_end = self._event_bounds(event)
+                if event_start < end and event_end > start:
+                    overlapping.append(event)
+            return overlapping
+        return None
     
     def check_conflicts(self, start: datetime, end: datetime) -> list:
         """Check if a time slot has conflicts."""
         start = self._ensure_timezone(start)
         end = self._ensure_timezone(end)
         
+        # Earlier tool calls in the same turn usually fetched a window covering this slot
+        cached = self._cached_events_between(start, end)
+        if cached is not None:
+            return cached
+        
         events = self.calendar.events().list(
             calendarId='primary',
             timeMin=start.isoformat(),
             timeMax=end.isoformat(),
             singleEvents=True,
-            timeZone=DEFAULT_TIMEZONE
+            timeZone=DEFAULT_TIMEZONE,
+            # A slot never has more overlapping events than this; callers only read these fields
+            maxResults=CONFLICT_MAX_RESULTS,
+            fields=EVENT_FIELDS
         ).execute()
         
         return events.get('items', [])
@@ -473,22 +889,20 @@ class GoogleServices:
         """Delete a calendar event by its ID."""
         try:
             self.calendar.events().delete(calendarId='primary', eventId=event_id).execute()
+            self._invalidate_cache('events')
             return True
         except Exception as e:
             print(f"Error deleting event: {e}")
             return False
     
     def find_event_by_name(self, search_term: str, days_ahead: int = 30) -> list:
-        """Find events matching a search term."""
+        """Find events matching a search term (searches the cached event window)."""
         events = self.get_events(days_ahead=days_ahead)
-        matching_events = []
-        
         search_lower = search_term.lower()
-        for event in events:
-            summary = event.get('summary', '').lower()
-            description = event.get('description', '').lower()
-            
-            if search_lower in summary or search_lower in description:
-                matching_events.append(event)
         
-        return matching_events
\ No newline at end of file
+        # Descriptions can be long, so only lowercase one when the summary doesn't match
+        return [
+            event for event in events
+            if search_lower in event.get('summary', '').lower()
+            or search_lower in event.get('description', '').lower()
+        ]
\ No newline at end of file
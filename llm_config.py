@@ -4,6 +4,8 @@ Utilities for checking LLM provider availability and managing default provider c
 """
 import os
 import json
+import tempfile
+import time
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
@@ -38,6 +40,17 @@ PROVIDER_CONFIG = {
     }
 }
 
+PROVIDER_STATE_FILE = 'llm_provider_state.json'
+
+# How long an Ollama ping result is reused before pinging again
+OLLAMA_CHECK_TTL_SECONDS = 30
+
+# Last Ollama ping: (monotonic time checked, result)
+_ollama_check = (None, False)
+
+# Parsed state file: (mtime_ns it was read at, default provider)
+_state_cache = (None, None)
+
 
 def check_provider_availability(provider_id: str) -> bool:
     """
@@ -63,20 +76,34 @@ def check_provider_availability(provider_id: str) -> bool:
     
     # For Llama (Ollama), check if base URL is accessible (optional check)
     if provider_id == 'llama':
-        try:
-            import requests
-            base_url = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
-            # Try to ping Ollama (quick check)
-            response = requests.get(f"{base_url}/api/tags", timeout=2)
-            return response.status_code == 200
-        except:
-            # If Ollama not running, still consider it available (user can start it)
-            # This allows selecting Llama even if Ollama is temporarily down
-            return True
+        return _check_ollama()
     
     return False
 
 
+def _check_ollama() -> bool:
+    """Ping Ollama, reusing the result for OLLAMA_CHECK_TTL_SECONDS."""
+    global _ollama_check
+    checked_at, available = _ollama_check
+    now = time.monotonic()
+    if checked_at is not None and now - checked_at < OLLAMA_CHECK_TTL_SECONDS:
+        return available
+    
+    try:
+        import requests
+        base_url = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
+        # Try to ping Ollama (quick check)
+        response = requests.get(f"{base_url}/api/tags", timeout=2)
+        available = response.status_code == 200
+    except:
+        # If Ollama not running, still consider it available (user can start it)
+        # This allows selecting Llama even if Ollama is temporarily down
+        available = True
+    
+    _ollama_check = (now, available)
+    return available
+
+
 def get_available_providers() -> Dict[str, Dict]:
     """
     Get list of all providers with their availability status.
@@ -100,15 +127,25 @@ def get_default_provider() -> Optional[str]:
     Returns:
         Provider ID or None if not set
     """
-    state_file = 'llm_provider_state.json'
-    if os.path.exists(state_file):
-        try:
-            with open(state_file, 'r') as f:
-                state = json.load(f)
-                return state.get('default_provider')
-        except:
-            pass
-    return None
+    global _state_cache
+    try:
+        mtime = os.stat(PROVIDER_STATE_FILE).st_mtime_ns
+    except OSError:
+        return None
+    
+    # Only re-read the file when it has changed
+    cached_mtime, cached_provider = _state_cache
+    if mtime == cached_mtime:
+        return cached_provider
+    
+    try:
+        with open(PROVIDER_STATE_FILE, 'r') as f:
+            state = json.load(f)
+        provider = state.get('default_provider')
+    except:
+        return None
+    _state_cache = (mtime, provider)
+    return provider
 
 
 def set_default_provider(provider_id: str) -> bool:
@@ -128,11 +165,24 @@ def set_default_provider(provider_id: str) -> bool:
     if not check_provider_availability(provider_id):
         return False
     
-    state_file = 'llm_provider_state.json'
+    # Nothing to write if it is already the default
+    if get_default_provider() == provider_id:
+        return True
+    
+    global _state_cache
     try:
         state = {'default_provider': provider_id}
-        with open(state_file, 'w') as f:
-            json.dump(state, f, indent=2)
+        # Write to a temp file and rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(PROVIDER_STATE_FILE)),
+                                        suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_path, PROVIDER_STATE_FILE)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        _state_cache = (os.stat(PROVIDER_STATE_FILE).st_mtime_ns, provider_id)
         return True
     except Exception as e:
         print(f"Error saving provider state: {e}")
@@ -6,20 +6,50 @@ Supports: Claude (Anthropic), ChatGPT (OpenAI), Grok (xAI), Llama (via Ollama),
 import os
 import json
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Any
+from types import SimpleNamespace
+from typing import Callable, List, Dict, Optional, Any, Generator
 from dotenv import load_dotenv
 
+# Use orjson for parsing tool-call arguments and API responses if available
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 load_dotenv()
 
 
+def parse_json(data):
+    """Parse a JSON string or bytes."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
     
+    # (provider class, API key) -> SDK client
+    _clients: Dict[tuple, Any] = {}
+    
     @abstractmethod
     def __init__(self, api_key: Optional[str] = None):
         """Initialize the LLM provider with API key."""
         pass
     
+    @classmethod
+    def _shared_client(cls, api_key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Get this provider's client for an API key, creating it with factory() on first use.
+        SDK clients are thread-safe and pool connections, so instances share one per key.
+        """
+        key = (cls, api_key)
+        client = LLMProvider._clients.get(key)
+        if client is None:
+            client = LLMProvider._clients.setdefault(key, factory())
+        return client
+    
     @abstractmethod
     def create_message(
         self,
@@ -27,7 +57,8 @@ class LLMProvider(ABC):
         system_prompt: str,
         tools: Optional[List[Dict]] = None,
         max_tokens: int = 4096,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        system_context: Optional[str] = None
     ) -> Any:
         """
         Create a message with the LLM.
@@ -38,12 +69,129 @@ class LLMProvider(ABC):
             tools: Optional list of tool definitions
             max_tokens: Maximum tokens to generate
             model: Optional model name (uses default if not provided)
+            system_context: Optional per-request text appended after the system
+                           prompt (kept separate so the stable prompt can be cached)
         
         Returns:
             Response object from the provider
         """
         pass
     
+    def stream_message(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: str,
+        tools: Optional[List[Dict]] = None,
+        max_tokens: int = 4096,
+        model: Optional[str] = None,
+        system_context: Optional[str] = None
+    ) -> Generator[str, None, Any]:
+        """
+        Create a message with the LLM, yielding text as it is generated.
+        
+        Providers without streaming support yield the full text once.
+        
+        Returns:
+            The final response object (as the generator's return value)
+        """
+        response = self.create_message(
+            messages=messages,
+            system_prompt=system_prompt,
+            tools=tools,
+            max_tokens=max_tokens,
+            model=model,
+            system_context=system_context
+        )
+        text = self.extract_text_from_response(response)
+        if text:
+            yield text
+        return response
+    
+    def _combine_system_prompt(self, system_prompt: str, system_context: Optional[str]) -> str:
+        """Join the system prompt and per-request context for providers without prompt caching."""
+        if system_context:
+            return f"{system_prompt}\n\n{system_context}"
+        return system_prompt
+    
+    def _format_openai_messages(self, messages: List[Dict[str, Any]], system_prompt: str,
+                                system_context: Optional[str]) -> List[Dict[str, Any]]:
+        """Convert the conversation to the OpenAI chat format, with the system prompt first."""
+        formatted_messages = [{"role": "system", "content": self._combine_system_prompt(system_prompt, system_context)}]
+        for msg in messages:
+            content = msg.get('content', '')
+            if not isinstance(content, list):
+                formatted_messages.append({"role": msg.get('role', 'user'), "content": content})
+                continue
+            # Convert Anthropic tool result format to OpenAI format
+            formatted_messages.extend({
+                "role": "tool",
+                "tool_call_id": item.get('tool_use_id'),
+                "content": item.get('content', '')
+            } for item in content if item.get('type') == 'tool_result')
+        return formatted_messages
+    
+    def _stream_openai_chat(self, **request) -> Generator[str, None, Any]:
+        """
+        Stream a chat completion from an OpenAI-compatible client, yielding text deltas.
+        
+        Returns:
+            A response shaped like a ChatCompletion (choices[0].message/finish_reason),
+            rebuilt from the deltas, so the extract_* methods work unchanged
+        """
+        text_parts = []
+        tool_calls = {}  # index -> {'id', 'name', 'arguments'}
+        finish_reason = None
+        for chunk in self.client.chat.completions.create(stream=True, **request):
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            delta = choice.delta
+            if delta.content:
+                text_parts.append(delta.content)
+                yield delta.content
+            # Tool call ids/names arrive in the first delta for a call, arguments in pieces
+            for call in delta.tool_calls or ():
+                entry = tool_calls.setdefault(call.index, {'id': None, 'name': '', 'arguments': []})
+                if call.id:
+                    entry['id'] = call.id
+                if call.function:
+                    entry['name'] += call.function.name or ''
+                    entry['arguments'].append(call.function.arguments or '')
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+        
+        message = SimpleNamespace(
+            content=''.join(text_parts) or None,
+            tool_calls=[
+                SimpleNamespace(id=entry['id'], function=SimpleNamespace(
+                    name=entry['name'], arguments=''.join(entry['arguments']) or '{}'
+                ))
+                for _, entry in sorted(tool_calls.items())
+            ] or None
+        )
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason=finish_reason)])
+    
+    # Last (tools, converted) pair; the assistant passes the same module-level list every call
+    _openai_tools: Optional[tuple] = None
+    
+    def _format_openai_tools(self, tools: Optional[List[Dict]]) -> Optional[List[Dict]]:
+        """Convert Anthropic-style tool definitions to the OpenAI function format, once per list."""
+        if not tools:
+            return None
+        cached = LLMProvider._openai_tools
+        if cached is not None and cached[0] is tools:
+            return cached[1]
+        formatted_tools = [{
+            "type": "function",
+            "function": {
+                "name": tool.get("name"),
+                "description": tool.get("description"),
+                "parameters": tool.get("input_schema", {})
+            }
+        } for tool in tools]
+        LLMProvider._openai_tools = (tools, formatted_tools)
+        return formatted_tools
+    
     @abstractmethod
     def extract_text_from_response(self, response: Any) -> str:
         """Extract text content from the response object."""
@@ -73,43 +221,87 @@ class ClaudeProvider(LLMProvider):
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment")
         
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        self.client = self._shared_client(self.api_key, lambda: anthropic.Anthropic(api_key=self.api_key))
         self.default_model = "claude-sonnet-4-20250514"
     
+    def _system_blocks(self, system_prompt: str, system_context: Optional[str]) -> List[Dict]:
+        """
+        Build the system blocks with a prompt-cache breakpoint after the stable prompt.
+        
+        The cached prefix covers the tool definitions and the stable system prompt,
+        so only the per-request context is re-read at full input cost.
+        """
+        blocks = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+        if system_context:
+            blocks.append({"type": "text", "text": system_context})
+        return blocks
+    
+    def _cached_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Add a prompt-cache breakpoint at the end of the conversation.
+        
+        Each tool-use iteration resends the whole history, so the next request
+        reads everything up to here from the cache. The history itself is not modified.
+        """
+        if not messages or messages[-1].get('role') != 'user':
+            return messages
+        last = messages[-1]
+        content = last['content']
+        if isinstance(content, str) and content:
+            blocks = [{"type": "text", "text": content}]
+        elif isinstance(content, list) and content and isinstance(content[-1], dict):
+            blocks = list(content)
+        else:
+            return messages
+        blocks[-1] = {**blocks[-1], "cache_control": {"type": "ephemeral"}}
+        return messages[:-1] + [{**last, "content": blocks}]
+    
     def create_message(
         self,
         messages: List[Dict[str, Any]],
         system_prompt: str,
         tools: Optional[List[Dict]] = None,
         max_tokens: int = 4096,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        system_context: Optional[str] = None
     ) -> Any:
         model = model or self.default_model
         return self.client.messages.create(
             model=model,
             max_tokens=max_tokens,
-            system=system_prompt,
+            system=self._system_blocks(system_prompt, system_context),
             tools=tools,
-            messages=messages
+            messages=self._cached_messages(messages)
         )
     
+    def stream_message(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: str,
+        tools: Optional[List[Dict]] = None,
+        max_tokens: int = 4096,
+        model: Optional[str] = None,
+        system_context: Optional[str] = None
+    ) -> Generator[str, None, Any]:
+        model = model or self.default_model
+        with self.client.messages.stream(
+            model=model,
+            max_tokens=max_tokens,
+            system=self._system_blocks(system_prompt, system_context),
+            tools=tools,
+            messages=self._cached_messages(messages)
+        ) as stream:
+            yield from stream.text_stream
+            return stream.get_final_message()
+    
     def extract_text_from_response(self, response: Any) -> str:
-        text_parts = []
-        for block in response.content:
-            if hasattr(block, 'text'):
-                text_parts.append(block.text)
-        return ''.join(text_parts)
+        return ''.join(block.text for block in response.content if block.type == 'text')
     
     def extract_tool_use(self, response: Any) -> List[Dict]:
-        tool_uses = []
-        for block in response.content:
-            if hasattr(block, 'type') and block.type == 'tool_use':
-                tool_uses.append({
-                    'id': block.id,
-                    'name': block.name,
-                    'input': block.input
-                })
-        return tool_uses
+        return [
+            {'id': block.id, 'name': block.name, 'input': block.input}
+            for block in response.content if block.type == 'tool_use'
+        ]
     
     def get_stop_reason(self, response: Any) -> str:
         return response.stop_reason or 'end_turn'
@@ -128,7 +320,7 @@ class ChatGPTProvider(LLMProvider):
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY not found in environment")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = self._shared_client(self.api_key, lambda: OpenAI(api_key=self.api_key))
         self.default_model = "gpt-4-turbo-preview"
     
     def create_message(
@@ -137,43 +329,16 @@ class ChatGPTProvider(LLMProvider):
         system_prompt: str,
         tools: Optional[List[Dict]] = None,
         max_tokens: int = 4096,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        system_context: Optional[str] = None
     ) -> Any:
         model = model or self.default_model
         
         # Convert messages format and prepend system prompt
-        formatted_messages = [{"role": "system", "content": system_prompt}]
-        
-        for msg in messages:
-            role = msg.get('role', 'user')
-            content = msg.get('content', '')
-            
-            # Handle tool results
-            if isinstance(content, list):
-                # Convert Anthropic tool result format to OpenAI format
-                for item in content:
-                    if item.get('type') == 'tool_result':
-                        formatted_messages.append({
-                            "role": "tool",
-                            "tool_call_id": item.get('tool_use_id'),
-                            "content": item.get('content', '')
-                        })
-            else:
-                formatted_messages.append({"role": role, "content": content})
+        formatted_messages = self._format_openai_messages(messages, system_prompt, system_context)
         
         # Convert tools format if provided
-        formatted_tools = None
-        if tools:
-            formatted_tools = []
-            for tool in tools:
-                formatted_tools.append({
-                    "type": "function",
-                    "function": {
-                        "name": tool.get("name"),
-                        "description": tool.get("description"),
-                        "parameters": tool.get("input_schema", {})
-                    }
-                })
+        formatted_tools = self._format_openai_tools(tools)
         
         return self.client.chat.completions.create(
             model=model,
@@ -182,6 +347,22 @@ class ChatGPTProvider(LLMProvider):
             max_tokens=max_tokens
         )
     
+    def stream_message(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: str,
+        tools: Optional[List[Dict]] = None,
+        max_tokens: int = 4096,
+        model: Optional[str] = None,
+        system_context: Optional[str] = None
+    ) -> Generator[str, None, Any]:
+        return self._stream_openai_chat(
+            model=model or self.default_model,
+            messages=self._format_openai_messages(messages, system_prompt, system_context),
+            tools=self._format_openai_tools(tools),
+            max_tokens=max_tokens
+        )
+    
     def extract_text_from_response(self, response: Any) -> str:
         if response.choices and len(response.choices) > 0:
             return response.choices[0].message.content or ""
@@ -196,7 +377,7 @@ class ChatGPTProvider(LLMProvider):
                     tool_uses.append({
                         'id': tool_call.id,
                         'name': tool_call.function.name,
-                        'input': json.loads(tool_call.function.arguments)
+                        'input': parse_json(tool_call.function.arguments)
                     })
         return tool_uses
     
@@ -223,10 +404,10 @@ class GrokProvider(LLMProvider):
             raise ValueError("GROK_API_KEY or XAI_API_KEY not found in environment")
         
         # Grok uses OpenAI-compatible API
-        self.client = OpenAI(
+        self.client = self._shared_client(self.api_key, lambda: OpenAI(
             api_key=self.api_key,
             base_url="https://api.x.ai/v1"
-        )
+        ))
         self.default_model = "grok-beta"
     
     def create_message(
@@ -235,38 +416,13 @@ class GrokProvider(LLMProvider):
         system_prompt: str,
         tools: Optional[List[Dict]] = None,
         max_tokens: int = 4096,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        system_context: Optional[str] = None
     ) -> Any:
         # Grok uses OpenAI-compatible format
         model = model or self.default_model
-        formatted_messages = [{"role": "system", "content": system_prompt}]
-        
-        for msg in messages:
-            role = msg.get('role', 'user')
-            content = msg.get('content', '')
-            if isinstance(content, list):
-                for item in content:
-                    if item.get('type') == 'tool_result':
-                        formatted_messages.append({
-                            "role": "tool",
-                            "tool_call_id": item.get('tool_use_id'),
-                            "content": item.get('content', '')
-                        })
-            else:
-                formatted_messages.append({"role": role, "content": content})
-        
-        formatted_tools = None
-        if tools:
-            formatted_tools = []
-            for tool in tools:
-                formatted_tools.append({
-                    "type": "function",
-                    "function": {
-                        "name": tool.get("name"),
-                        "description": tool.get("description"),
-                        "parameters": tool.get("input_schema", {})
-                    }
-                })
+        formatted_messages = self._format_openai_messages(messages, system_prompt, system_context)
+        formatted_tools = self._format_openai_tools(tools)
         
         return self.client.chat.completions.create(
             model=model,
@@ -275,6 +431,22 @@ class GrokProvider(LLMProvider):
             max_tokens=max_tokens
         )
     
+    def stream_message(
+        self,
+        messages: List[Dict[str, Any]],
+        system_prompt: str,
+        tools: Optional[List[Dict]] = None,
+        max_tokens: int = 4096,
+        model: Optional[str] = None,
+        system_context: Optional[str] = None
+    ) -> Generator[str, None, Any]:
+        return self._stream_openai_chat(
+            model=model or self.default_model,
+            messages=self._format_openai_messages(messages, system_prompt, system_context),
+            tools=self._format_openai_tools(tools),
+            max_tokens=max_tokens
+        )
+    
     def extract_text_from_response(self, response: Any) -> str:
         if response.choices and len(response.choices) > 0:
             return response.choices[0].message.content or ""
@@ -289,7 +461,7 @@ class GrokProvider(LLMProvider):
                     tool_uses.append({
                         'id': tool_call.id,
                         'name': tool_call.function.name,
-                        'input': json.loads(tool_call.function.arguments)
+                        'input': parse_json(tool_call.function.arguments)
                     })
         return tool_uses
     
@@ -314,6 +486,8 @@ class LlamaProvider(LLMProvider):
         self.base_url = base_url or os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
         self.default_model = os.getenv('OLLAMA_MODEL', 'llama3')
         self.api_key = api_key  # Usually not needed for local Ollama
+        # Keep the connection to Ollama open between calls
+        self.session = requests.Session()
     
     def create_message(
         self,
@@ -321,14 +495,13 @@ class LlamaProvider(LLMProvider):
         system_prompt: str,
         tools: Optional[List[Dict]] = None,
         max_tokens: int = 4096,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        system_context: Optional[str] = None
     ) -> Any:
-        import requests
-        
         model = model or self.default_model
         
         # Ollama format: combine system prompt with messages
-        formatted_messages = [{"role": "system", "content": system_prompt}]
+        formatted_messages = [{"role": "system", "content": self._combine_system_prompt(system_prompt, system_context)}]
         
         for msg in messages:
             role = msg.get('role', 'user')
@@ -341,19 +514,21 @@ class LlamaProvider(LLMProvider):
         if tools:
             print("Warning: Tool calling support in Ollama may be limited")
         
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/api/chat",
             json={
                 "model": model,
                 "messages": formatted_messages,
                 "options": {
                     "num_predict": max_tokens
-                }
+                },
+                # /api/chat streams NDJSON by default; ask for one response object
+                "stream": False
             },
             timeout=120
         )
         response.raise_for_status()
-        return response.json()
+        return parse_json(response.content)
     
     def extract_text_from_response(self, response: Any) -> str:
         if isinstance(response, dict):
@@ -371,6 +546,10 @@ class LlamaProvider(LLMProvider):
         return 'stop'
 
 
+# Text-only conversation roles Gemini's prompt includes, and how each is labelled
+GEMINI_ROLE_PREFIXES = {'user': 'User: ', 'assistant': 'Assistant: '}
+
+
 class GeminiProvider(LLMProvider):
     """Gemini (Google) provider implementation."""
     
@@ -393,7 +572,8 @@ class GeminiProvider(LLMProvider):
         system_prompt: str,
         tools: Optional[List[Dict]] = None,
         max_tokens: int = 4096,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        system_context: Optional[str] = None
     ) -> Any:
         import google.generativeai as genai
         
@@ -401,17 +581,17 @@ class GeminiProvider(LLMProvider):
         
         # Convert messages format for Gemini
         # Gemini uses a different format - combine system with first user message
-        history = []
-        current_content = system_prompt + "\n\n"
+        # Built as a list and joined once; repeated += copies the growing prompt each time
+        parts = [self._combine_system_prompt(system_prompt, system_context) + "\n\n"]
         
         for msg in messages:
-            role = msg.get('role', 'user')
+            prefix = GEMINI_ROLE_PREFIXES.get(msg.get('role', 'user'))
             content = msg.get('content', '')
             
-            if role == 'user' and isinstance(content, str):
-                current_content += f"User: {content}\n"
-            elif role == 'assistant' and isinstance(content, str):
-                current_content += f"Assistant: {content}\n"
+            if prefix is not None and isinstance(content, str):
+                parts.append(f"{prefix}{content}\n")
+        
+        current_content = ''.join(parts)
         
         # Note: Gemini tool support requires different setup
         if tools:
@@ -437,6 +617,22 @@ class GeminiProvider(LLMProvider):
         return 'stop'
 
 
+# Provider name (and aliases) -> provider class
+PROVIDERS = {
+    'claude': ClaudeProvider,
+    'anthropic': ClaudeProvider,
+    'chatgpt': ChatGPTProvider,
+    'openai': ChatGPTProvider,
+    'gpt': ChatGPTProvider,
+    'grok': GrokProvider,
+    'xai': GrokProvider,
+    'llama': LlamaProvider,
+    'ollama': LlamaProvider,
+    'gemini': GeminiProvider,
+    'google': GeminiProvider
+}
+
+
 def get_llm_provider(provider_name: Optional[str] = None, **kwargs) -> LLMProvider:
     """
     Factory function to get the appropriate LLM provider.
@@ -451,25 +647,11 @@ def get_llm_provider(provider_name: Optional[str] = None, **kwargs) -> LLMProvid
     """
     provider_name = (provider_name or os.getenv('LLM_PROVIDER', 'claude')).lower()
     
-    providers = {
-        'claude': ClaudeProvider,
-        'anthropic': ClaudeProvider,
-        'chatgpt': ChatGPTProvider,
-        'openai': ChatGPTProvider,
-        'gpt': ChatGPTProvider,
-        'grok': GrokProvider,
-        'xai': GrokProvider,
-        'llama': LlamaProvider,
-        'ollama': LlamaProvider,
-        'gemini': GeminiProvider,
-        'google': GeminiProvider
-    }
-    
-    provider_class = providers.get(provider_name)
+    provider_class = PROVIDERS.get(provider_name)
     if not provider_class:
         raise ValueError(
             f"Unknown provider: {provider_name}. "
-            f"Supported providers: {', '.join(set(providers.keys()))}"
+            f"Supported providers: {', '.join(PROVIDERS)}"
         )
     
     try:
@@ -1,14 +1,145 @@
 # news_services.py
 import os
 import re
+import json
+import time
+import calendar
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from typing import List, Optional
 from dotenv import load_dotenv
 import requests
 from datetime import datetime
 
+# Use orjson for parsing API responses if available
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Load environment variables
 load_dotenv()
 
+# Headlines barely change within this window, and the free NewsAPI tier allows 100 requests/day
+NEWS_CACHE_TTL_SECONDS = 600
+
+# Topics with no NewsAPI category, served by keyword search instead (topic -> search query)
+SEARCH_TOPIC_QUERIES = {
+    'marketing': 'marketing',
+    'stocks': 'stocks OR stock market',
+    'stock market': 'stocks OR stock market'
+}
+
+
+def parse_json(data):
+    """Parse a JSON string or bytes."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Reputable news sources (finite list - major established outlets only)
+# These are normalized to lowercase for matching
+REPUTABLE_SOURCES = frozenset({
+    # Major US newspapers
+    'the new york times', 'new york times', 'nytimes', 'nyt',
+    'the washington post', 'washington post', 'wapo',
+    'wall street journal', 'wsj',
+    'los angeles times', 'la times',
+    'chicago tribune',
+    'boston globe',
+    'usa today',
+
+    # News networks
+    'abc news', 'abc',
+    'cbs news', 'cbs',
+    'nbc news', 'nbc',
+    'cnn',
+    'fox news',
+    'msnbc',
+    'pbs news', 'pbs',
+    'npr',
+
+    # Business/Financial
+    'bloomberg', 'bloomberg news',
+    'reuters',
+    'associated press', 'ap news', 'ap',
+    'financial times', 'ft',
+    'cnbc',
+    'forbes',
+    'the economist',
+
+    # Political/Policy
+    'politico',
+    'axios',
+    'the hill',
+
+    # International
+    'bbc', 'bbc news',
+    'the guardian',
+    'the times',
+    'time',
+    'newsweek',
+
+    # Technology (reputable tech news)
+    'techcrunch',
+    'the verge',
+    'wired',
+    'ars technica',
+    'engadget',
+
+    # Business/Finance
+    'business insider',
+    'marketwatch',
+    'yahoo finance',
+    'yahoo news'
+})
+
+# For partial matches: reputable names inside a source name are found in one pass,
+# and a source name inside a reputable name is one search of the joined names
+REPUTABLE_SOURCES_RE = re.compile('|'.join(map(re.escape, REPUTABLE_SOURCES)))
+REPUTABLE_SOURCE_NAMES = '\n'.join(REPUTABLE_SOURCES)
+
+# Patterns that indicate blogs or non-reputable sources
+BLOG_PATTERNS = [
+    r'\.(blog|wordpress|tumblr|medium|substack)\.',
+    r'\b(blog|blogger|blogging)\b',
+    r'\b(fan|fansite|fans)\b',
+    r'\.com/blog/',
+    r'/blog/',
+]
+# All patterns in one compiled alternation, so each check is a single scan
+BLOG_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in BLOG_PATTERNS), re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def is_reputable_source(source_name: str) -> bool:
+    """Check if a source is in the reputable sources list (cached - a few sources recur across articles)."""
+    if not source_name:
+        return False
+    
+    source_lower = source_name.lower().strip()
+    
+    # Direct match
+    if source_lower in REPUTABLE_SOURCES:
+        return True
+    
+    # Check for partial matches (e.g., "The New York Times" matches "new york times")
+    if REPUTABLE_SOURCES_RE.search(source_lower):
+        return True
+    return '\n' not in source_lower and source_lower in REPUTABLE_SOURCE_NAMES
+
+
+def is_blog(source_name: str, url: str = '') -> bool:
+    """Check if a source name or article URL matches a blog pattern."""
+    # BLOG_RE ignores case, so each part is searched as-is rather than lowercased and joined
+    if source_name and BLOG_RE.search(source_name):
+        return True
+    return bool(url) and BLOG_RE.search(url) is not None
+
 
 class NewsServices:
     def __init__(self):
@@ -16,6 +147,10 @@ class NewsServices:
         # NewsAPI credentials from environment variables
         self.api_key = os.getenv('NEWS_API_KEY')
         self.base_url = 'https://newsapi.org/v2'
+        # Reuse one keep-alive connection to NewsAPI across requests
+        self.session = requests.Session()
+        # (kind, *args) -> (monotonic time fetched, articles)
+        self._cache = {}
         
         if not self.api_key:
             raise ValueError(
@@ -41,72 +176,6 @@ class NewsServices:
             'general': 'general',
             'default': 'general'
         }
-        
-        # Reputable news sources (finite list - major established outlets only)
-        # These are normalized to lowercase for matching
-        self.reputable_sources = {
-            # Major US newspapers
-            'the new york times', 'new york times', 'nytimes', 'nyt',
-            'the washington post', 'washington post', 'wapo',
-            'wall street journal', 'wsj',
-            'los angeles times', 'la times',
-            'chicago tribune',
-            'boston globe',
-            'usa today',
-            
-            # News networks
-            'abc news', 'abc',
-            'cbs news', 'cbs',
-            'nbc news', 'nbc',
-            'cnn',
-            'fox news',
-            'msnbc',
-            'pbs news', 'pbs',
-            'npr',
-            
-            # Business/Financial
-            'bloomberg', 'bloomberg news',
-            'reuters',
-            'associated press', 'ap news', 'ap',
-            'financial times', 'ft',
-            'cnbc',
-            'forbes',
-            'the economist',
-            
-            # Political/Policy
-            'politico',
-            'axios',
-            'the hill',
-            
-            # International
-            'bbc', 'bbc news',
-            'the guardian',
-            'the times',
-            'time',
-            'newsweek',
-            
-            # Technology (reputable tech news)
-            'techcrunch',
-            'the verge',
-            'wired',
-            'ars technica',
-            'engadget',
-            
-            # Business/Finance
-            'business insider',
-            'marketwatch',
-            'yahoo finance',
-            'yahoo news'
-        }
-        
-        # Patterns that indicate blogs or non-reputable sources
-        self.blog_patterns = [
-            r'\.(blog|wordpress|tumblr|medium|substack)\.',
-            r'\b(blog|blogger|blogging)\b',
-            r'\b(fan|fansite|fans)\b',
-            r'\.com/blog/',
-            r'/blog/',
-        ]
     
     def _is_reputable_source(self, source_name: str) -> bool:
         """
@@ -118,21 +187,7 @@ class NewsServices:
         Returns:
             True if source is reputable, False otherwise
         """
-        if not source_name:
-            return False
-        
-        source_lower = source_name.lower().strip()
-        
-        # Direct match
-        if source_lower in self.reputable_sources:
-            return True
-        
-        # Check for partial matches (e.g., "The New York Times" matches "new york times")
-        for reputable in self.reputable_sources:
-            if reputable in source_lower or source_lower in reputable:
-                return True
-        
-        return False
+        return is_reputable_source(source_name)
     
     def _is_blog(self, source_name: str, url: str = '') -> bool:
         """
@@ -145,43 +200,56 @@ class NewsServices:
         Returns:
             True if source appears to be a blog, False otherwise
         """
-        if not source_name and not url:
-            return False
-        
-        text = f"{source_name} {url}".lower()
-        
-        # Check for blog patterns
-        for pattern in self.blog_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        
-        return False
+        return is_blog(source_name, url)
     
-    def _filter_articles_by_source(self, articles: List[dict]) -> List[dict]:
+    def _build_articles(self, raw_articles: List[dict], limit: int) -> List[dict]:
         """
-        Filter articles to only include those from reputable sources, excluding blogs.
+        Build article dictionaries from a NewsAPI response, keeping only reputable non-blog sources.
         
         Args:
-            articles: List of article dictionaries
+            raw_articles: The 'articles' list from the NewsAPI response
+            limit: Maximum number of articles to return
         
         Returns:
-            Filtered list of articles from reputable sources only
+            Up to limit article dictionaries, in response order
         """
-        filtered = []
+        articles = []
         
-        for article in articles:
-            source_name = article.get('source', '')
+        for article in raw_articles:
+            source_name = article.get('source', {}).get('name', 'Unknown')
             url = article.get('url', '')
             
-            # Skip if it's a blog
-            if self._is_blog(source_name, url):
+            # Skip blogs and sources that aren't reputable before building the dict
+            if self._is_blog(source_name, url) or not self._is_reputable_source(source_name):
                 continue
             
-            # Only include if source is reputable
-            if self._is_reputable_source(source_name):
-                filtered.append(article)
-        
-        return filtered
+            articles.append({
+                'title': article.get('title', 'No title'),
+                'description': article.get('description', ''),
+                'url': url,
+                'source': source_name,
+                'published_at': article.get('publishedAt', ''),
+                'author': article.get('author', ''),
+                'image_url': article.get('urlToImage', '')
+            })
+            if len(articles) >= limit:
+                break
+        
+        return articles
+    
+    def _cache_get(self, key: tuple) -> Optional[List[dict]]:
+        """Return cached articles for key if fetched within NEWS_CACHE_TTL_SECONDS."""
+        entry = self._cache.get(key)
+        if entry is None or time.monotonic() - entry[0] >= NEWS_CACHE_TTL_SECONDS:
+            return None
+        return list(entry[1])
+    
+    def _cache_put(self, key: tuple, articles: List[dict]):
+        """Store articles for key, dropping expired entries."""
+        now = time.monotonic()
+        for old_key in [k for k, (fetched, _) in list(self._cache.items()) if now - fetched >= NEWS_CACHE_TTL_SECONDS]:
+            self._cache.pop(old_key, None)
+        self._cache[key] = (now, articles)
     
     def get_top_headlines(self, topic: str = 'general', country: str = 'us', 
                          limit: int = 5) -> List[dict]:
@@ -197,12 +265,18 @@ class NewsServices:
             List of article dictionaries with title, description, url, source, etc.
         """
         # Map topic to NewsAPI category
-        category = self.topic_categories.get(topic.lower(), 'general')
+        topic_lower = topic.lower()
+        category = self.topic_categories.get(topic_lower, 'general')
         
         # For marketing/stocks, we'll use keyword search instead of category
-        if topic.lower() in ['marketing', 'stocks']:
+        if topic_lower in ('marketing', 'stocks'):
             return self.search_articles(query=topic, limit=limit)
         
+        cache_key = ('headlines', category, country, limit)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Build API request - fetch more to account for filtering
         url = f"{self.base_url}/top-headlines"
         params = {
@@ -216,30 +290,20 @@ class NewsServices:
         params = {k: v for k, v in params.items() if v is not None}
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json(response.content)
             
             if data.get('status') != 'ok':
                 raise Exception(f"News API error: {data.get('message', 'Unknown error')}")
             
-            articles = []
-            for article in data.get('articles', []):
-                articles.append({
-                    'title': article.get('title', 'No title'),
-                    'description': article.get('description', ''),
-                    'url': article.get('url', ''),
-                    'source': article.get('source', {}).get('name', 'Unknown'),
-                    'published_at': article.get('publishedAt', ''),
-                    'author': article.get('author', ''),
-                    'image_url': article.get('urlToImage', '')
-                })
+            # Only reputable sources, up to limit
+            filtered_articles = self._build_articles(data.get('articles', ()), limit)
+            self._cache_put(cache_key, filtered_articles)
+            return list(filtered_articles)
             
-            # Filter to only reputable sources and return up to limit
-            filtered_articles = self._filter_articles_by_source(articles)
-            return filtered_articles[:limit]
-            
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError: the response body was not valid JSON
             raise Exception(f"Failed to fetch news: {str(e)}")
     
     def search_articles(self, query: str, limit: int = 5, 
@@ -255,6 +319,11 @@ class NewsServices:
         Returns:
             List of article dictionaries
         """
+        cache_key = ('search', query, sort_by, limit)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         url = f"{self.base_url}/everything"
         params = {
             'apiKey': self.api_key,
@@ -265,30 +334,20 @@ class NewsServices:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json(response.content)
             
             if data.get('status') != 'ok':
                 raise Exception(f"News API error: {data.get('message', 'Unknown error')}")
             
-            articles = []
-            for article in data.get('articles', []):
-                articles.append({
-                    'title': article.get('title', 'No title'),
-                    'description': article.get('description', ''),
-                    'url': article.get('url', ''),
-                    'source': article.get('source', {}).get('name', 'Unknown'),
-                    'published_at': article.get('publishedAt', ''),
-                    'author': article.get('author', ''),
-                    'image_url': article.get('urlToImage', '')
-                })
+            # Only reputable sources, up to limit
+            filtered_articles = self._build_articles(data.get('articles', ()), limit)
+            self._cache_put(cache_key, filtered_articles)
+            return list(filtered_articles)
             
-            # Filter to only reputable sources and return up to limit
-            filtered_articles = self._filter_articles_by_source(articles)
-            return filtered_articles[:limit]
-            
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError: the response body was not valid JSON
             raise Exception(f"Failed to search news: {str(e)}")
     
     def get_news_by_topic(self, topic: str = 'general', limit: int = 5) -> List[dict]:
@@ -306,12 +365,12 @@ class NewsServices:
         topic_lower = topic.lower()
         
         # Handle specific topics that need keyword search
-        if topic_lower in ['marketing', 'stocks', 'stock market']:
-            search_query = 'marketing' if topic_lower == 'marketing' else 'stocks OR stock market'
+        search_query = SEARCH_TOPIC_QUERIES.get(topic_lower)
+        if search_query is not None:
             return self.search_articles(query=search_query, limit=limit, sort_by='popularity')
         
         # Use category-based search for standard topics
-        return self.get_top_headlines(topic=topic, limit=limit)
+        return self.get_top_headlines(topic=topic_lower, limit=limit)
 
 
 # Alternative: RSS Feed Parser (no API key needed, but less structured)
@@ -328,6 +387,11 @@ class RSSNewsServices:
         except ImportError:
             raise ImportError("feedparser library required. Install with: pip install feedparser")
         
+        # Feed URL -> (monotonic time checked, etag, modified, articles) from the last
+        # successful fetch: reused outright for NEWS_CACHE_TTL_SECONDS, then revalidated so
+        # unchanged feeds are answered with a 304 instead of re-downloaded and re-parsed
+        self._feed_cache = {}
+        
         # RSS feed URLs by topic (only reputable sources)
         self.feeds = {
             'general': [
@@ -354,103 +418,65 @@ class RSSNewsServices:
                 'https://feeds.finance.yahoo.com/rss/2.0/headline'
             ]
         }
-        
-        # Reputable sources list (same as NewsServices)
-        self.reputable_sources = {
-            'the new york times', 'new york times', 'nytimes', 'nyt',
-            'the washington post', 'washington post', 'wapo',
-            'wall street journal', 'wsj',
-            'los angeles times', 'la times',
-            'chicago tribune',
-            'boston globe',
-            'usa today',
-            'abc news', 'abc',
-            'cbs news', 'cbs',
-            'nbc news', 'nbc',
-            'cnn',
-            'fox news',
-            'msnbc',
-            'pbs news', 'pbs',
-            'npr',
-            'bloomberg', 'bloomberg news',
-            'reuters',
-            'associated press', 'ap news', 'ap',
-            'financial times', 'ft',
-            'cnbc',
-            'forbes',
-            'the economist',
-            'politico',
-            'axios',
-            'the hill',
-            'bbc', 'bbc news',
-            'the guardian',
-            'the times',
-            'time',
-            'newsweek',
-            'techcrunch',
-            'the verge',
-            'wired',
-            'ars technica',
-            'engadget',
-            'business insider',
-            'marketwatch',
-            'yahoo finance',
-            'yahoo news'
-        }
-        
-        # Patterns that indicate blogs
-        self.blog_patterns = [
-            r'\.(blog|wordpress|tumblr|medium|substack)\.',
-            r'\b(blog|blogger|blogging)\b',
-            r'\b(fan|fansite|fans)\b',
-            r'\.com/blog/',
-            r'/blog/',
-        ]
     
     def _is_reputable_source(self, source_name: str) -> bool:
         """Check if a source is in the reputable sources list."""
-        if not source_name:
-            return False
-        
-        source_lower = source_name.lower().strip()
-        
-        if source_lower in self.reputable_sources:
-            return True
-        
-        for reputable in self.reputable_sources:
-            if reputable in source_lower or source_lower in reputable:
-                return True
-        
-        return False
+        return is_reputable_source(source_name)
     
     def _is_blog(self, source_name: str, url: str = '') -> bool:
         """Check if a source appears to be a blog."""
-        if not source_name and not url:
+        return is_blog(source_name, url)
+    
+    def _is_allowed_article(self, article: dict) -> bool:
+        """Check that an article is from a reputable source and not a blog."""
+        source_name = article.get('source', '')
+        if self._is_blog(source_name, article.get('url', '')):
             return False
-        
-        text = f"{source_name} {url}".lower()
-        
-        for pattern in self.blog_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        
-        return False
+        return self._is_reputable_source(source_name)
     
-    def _filter_articles_by_source(self, articles: List[dict]) -> List[dict]:
-        """Filter articles to only include those from reputable sources, excluding blogs."""
-        filtered = []
+    def _fetch_feed(self, feed_url: str) -> List[tuple]:
+        """
+        Fetch one feed's articles, cached and revalidated with its ETag/Last-Modified.
+        On error the last good articles are returned (empty if there are none).
         
-        for article in articles:
-            source_name = article.get('source', '')
-            url = article.get('url', '')
+        Returns:
+            (published timestamp, article) pairs; the timestamp is 0 when the entry has no date
+        """
+        checked, etag, modified, cached_articles = self._feed_cache.get(feed_url, (None, None, None, None))
+        now = time.monotonic()
+        if checked is not None and now - checked < NEWS_CACHE_TTL_SECONDS:
+            return cached_articles
+        try:
+            feed = self.feedparser.parse(feed_url, etag=etag, modified=modified)
+            if feed.get('status') == 304 and cached_articles is not None:
+                self._feed_cache[feed_url] = (now, etag, modified, cached_articles)
+                return cached_articles
             
-            if self._is_blog(source_name, url):
-                continue
+            # feedparser reports network/HTTP failures instead of raising; keep the last
+            # good result (retried next call) rather than caching an empty feed
+            if (feed.get('bozo') and not feed.entries) or feed.get('status', 200) >= 400:
+                print(f"Error fetching feed {feed_url}: {feed.get('bozo_exception') or feed.get('status')}")
+                return cached_articles if cached_articles is not None else []
             
-            if self._is_reputable_source(source_name):
-                filtered.append(article)
-        
-        return filtered
+            articles = []
+            for entry in feed.entries:
+                # feedparser parses the date into a UTC struct_time (RFC 822 strings don't sort)
+                published = entry.get('published_parsed')
+                articles.append((calendar.timegm(published) if published else 0, {
+                    'title': entry.get('title', 'No title'),
+                    'description': entry.get('summary', ''),
+                    'url': entry.get('link', ''),
+                    'source': feed.feed.get('title', 'Unknown'),
+                    'published_at': entry.get('published', ''),
+                    'author': entry.get('author', ''),
+                    'image_url': None
+                }))
+        except Exception as e:
+            print(f"Error fetching feed {feed_url}: {e}")
+            return cached_articles if cached_articles is not None else []
+        
+        self._feed_cache[feed_url] = (now, feed.get('etag'), feed.get('modified'), articles)
+        return articles
     
     def get_top_articles(self, topic: str = 'general', limit: int = 5) -> List[dict]:
         """
@@ -466,31 +492,18 @@ class RSSNewsServices:
         topic_lower = topic.lower()
         feed_urls = self.feeds.get(topic_lower, self.feeds['general'])
         
-        all_articles = []
-        
-        for feed_url in feed_urls:
-            try:
-                feed = self.feedparser.parse(feed_url)
-                
-                # Fetch more articles to account for filtering
-                for entry in feed.entries[:limit * 3]:
-                    all_articles.append({
-                        'title': entry.get('title', 'No title'),
-                        'description': entry.get('summary', ''),
-                        'url': entry.get('link', ''),
-                        'source': feed.feed.get('title', 'Unknown'),
-                        'published_at': entry.get('published', ''),
-                        'author': entry.get('author', ''),
-                        'image_url': None
-                    })
-            except Exception as e:
-                print(f"Error fetching feed {feed_url}: {e}")
-                continue
+        # Feeds are independent downloads, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=len(feed_urls)) as executor:
+            feed_articles = list(executor.map(self._fetch_feed, feed_urls))
         
-        # Filter to only reputable sources
-        filtered_articles = self._filter_articles_by_source(all_articles)
+        # Only reputable sources; take more than limit from each feed to account for filtering
+        filtered_articles = (
+            pair
+            for articles in feed_articles
+            for pair in articles[:limit * 3]
+            if self._is_allowed_article(pair[1])
+        )
         
-        # Sort by published date (most recent first) and return top N
-        filtered_articles.sort(key=lambda x: x['published_at'], reverse=True)
-        return filtered_articles[:limit]
+        # Most recent N by published date, without sorting everything
+        return [article for _, article in heapq.nlargest(limit, filtered_articles, key=itemgetter(0))]
 
@@ -20,6 +20,19 @@ REDDIT_USER_AGENT = os.getenv('REDDIT_USER_AGENT', 'ExecutiveAssistant/1.0 by Yo
 # OAuth scopes - adjust based on what you need
 REDDIT_SCOPES = ['identity', 'read', 'mysubreddits']
 
+# Shared client for building authorization URLs, created on first use
+_url_reddit = None
+
+
+def _create_reddit() -> praw.Reddit:
+    """Create an unauthorized Reddit client for the OAuth app."""
+    return praw.Reddit(
+        client_id=REDDIT_CLIENT_ID,
+        client_secret=REDDIT_CLIENT_SECRET,
+        redirect_uri=REDDIT_REDIRECT_URI,
+        user_agent=REDDIT_USER_AGENT
+    )
+
 
 def get_reddit_oauth_url(state: str) -> str:
     """
@@ -31,14 +44,11 @@ def get_reddit_oauth_url(state: str) -> str:
     Returns:
         Authorization URL
     """
-    reddit = praw.Reddit(
-        client_id=REDDIT_CLIENT_ID,
-        client_secret=REDDIT_CLIENT_SECRET,
-        redirect_uri=REDDIT_REDIRECT_URI,
-        user_agent=REDDIT_USER_AGENT
-    )
+    global _url_reddit
+    if _url_reddit is None:
+        _url_reddit = _create_reddit()
     
-    auth_url = reddit.auth.url(scopes=REDDIT_SCOPES, state=state, duration='permanent')
+    auth_url = _url_reddit.auth.url(scopes=REDDIT_SCOPES, state=state, duration='permanent')
     return auth_url
 
 
@@ -53,12 +63,8 @@ def handle_reddit_callback(code: str, state: str) -> dict:
     Returns:
         Dictionary with access_token, refresh_token, and user info
     """
-    reddit = praw.Reddit(
-        client_id=REDDIT_CLIENT_ID,
-        client_secret=REDDIT_CLIENT_SECRET,
-        redirect_uri=REDDIT_REDIRECT_URI,
-        user_agent=REDDIT_USER_AGENT
-    )
+    # authorize() stores this user's tokens on the client, so each exchange gets its own
+    reddit = _create_reddit()
     
     # Exchange code for tokens
     reddit.auth.authorize(code)
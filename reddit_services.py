@@ -1,5 +1,12 @@
 # reddit_services.py
 import os
+import threading
+import time
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain
+from operator import itemgetter
 from typing import List, Optional
 from dotenv import load_dotenv
 import praw
@@ -7,6 +14,11 @@ import praw
 # Load environment variables
 load_dotenv()
 
+# Listings are reused for this long, so dashboard refreshes don't refetch every subreddit
+REDDIT_CACHE_TTL_SECONDS = 300
+# Subreddits fetched at once; each worker thread has its own praw.Reddit (PRAW isn't thread-safe)
+REDDIT_FETCH_WORKERS = 10
+
 
 class RedditServices:
     def __init__(self, access_token: Optional[str] = None, refresh_token: Optional[str] = None):
@@ -41,24 +53,26 @@ class RedditServices:
             )
         
         # Initialize Reddit instance
+        reddit_kwargs = {
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'user_agent': user_agent
+        }
         if access_token:
             # Web app OAuth flow
-            self.reddit = praw.Reddit(
-                client_id=client_id,
-                client_secret=client_secret,
-                user_agent=user_agent,
-                access_token=access_token,
-                refresh_token=refresh_token
-            )
-        else:
-            # CLI/script usage - username/password (deprecated but still works) or read-only
-            self.reddit = praw.Reddit(
-                client_id=client_id,
-                client_secret=client_secret,
-                user_agent=user_agent,
-                username=username if username else None,
-                password=password if password else None
-            )
+            reddit_kwargs.update(access_token=access_token, refresh_token=refresh_token)
+        elif username and password:
+            # CLI/script usage - username/password (deprecated but still works)
+            reddit_kwargs.update(username=username, password=password)
+        # Otherwise read-only, with no username/password for PRAW to try
+        self.reddit = praw.Reddit(**reddit_kwargs)
+        # Fetch workers live as long as this instance, so each builds (and authenticates) its client once
+        self._reddit_kwargs = reddit_kwargs
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=REDDIT_FETCH_WORKERS, thread_name_prefix='reddit')
+        # (subreddit name, time filter, limit) -> (monotonic time fetched, posts)
+        self._posts_cache = {}
+        self._posts_cache_lock = threading.Lock()  # written by the fetch workers
         
         # Verify connection
         try:
@@ -75,10 +89,7 @@ class RedditServices:
         try:
             if self.reddit.user.me():
                 # Authenticated user - get their subscriptions
-                subreddits = []
-                for subreddit in self.reddit.user.subreddits(limit=limit):
-                    subreddits.append(subreddit.display_name)
-                return subreddits
+                return [subreddit.display_name for subreddit in self.reddit.user.subreddits(limit=limit)]
             else:
                 # Not authenticated - return empty list or default subreddits
                 return []
@@ -102,44 +113,72 @@ class RedditServices:
         Returns:
             List of post dictionaries with title, score, subreddit, url, etc.
         """
-        all_posts = []
+        if not subreddit_names:
+            return []
+        
+        # Each subreddit is a separate blocking API call, so fetch them concurrently
+        fetch = partial(self._fetch_subreddit_posts, time_filter=time_filter,
+                        limit=limit_per_subreddit)
+        all_posts = chain.from_iterable(self._executor.map(fetch, subreddit_names))
+        
+        # Top N by score (upvotes), without sorting everything
+        return heapq.nlargest(total_limit, all_posts, key=itemgetter('score'))
+    
+    def _thread_reddit(self) -> praw.Reddit:
+        """Get this thread's Reddit client (PRAW's rate limiter and token refresh aren't thread-safe)."""
+        reddit = getattr(self._local, 'reddit', None)
+        if reddit is None:
+            reddit = praw.Reddit(**self._reddit_kwargs)
+            self._local.reddit = reddit
+        return reddit
+    
+    def _fetch_subreddit_posts(self, subreddit_name: str, time_filter: str, limit: int) -> List[dict]:
+        """Fetch post dictionaries from one subreddit (empty on error), cached for REDDIT_CACHE_TTL_SECONDS."""
+        cache_key = (subreddit_name, time_filter, limit)
+        with self._posts_cache_lock:
+            entry = self._posts_cache.get(cache_key)
+        if entry is not None and time.monotonic() - entry[0] < REDDIT_CACHE_TTL_SECONDS:
+            return [dict(post) for post in entry[1]]
         
-        for subreddit_name in subreddit_names:
-            try:
-                subreddit = self.reddit.subreddit(subreddit_name)
-                
-                # Get top posts based on time filter
-                # 'hot' = trending now (combination of score and recency)
-                # 'top' = highest scoring posts in time period
-                # For "hottest", we use 'hot' which is what Reddit shows on the front page
-                # But if user wants time-filtered top posts, we can use 'top' with time_filter
-                if time_filter and time_filter != 'all':
-                    # Use 'top' for time-filtered results (e.g., top posts today)
-                    posts = subreddit.top(limit=limit_per_subreddit, time_filter=time_filter)
-                else:
-                    # Use 'hot' for current hottest/trending posts
-                    posts = subreddit.hot(limit=limit_per_subreddit)
-                
-                for post in posts:
-                    all_posts.append({
-                        'title': post.title,
-                        'score': post.score,
-                        'subreddit': subreddit_name,
-                        'url': post.url,
-                        'permalink': f"https://reddit.com{post.permalink}",
-                        'author': str(post.author),
-                        'num_comments': post.num_comments,
-                        'created_utc': post.created_utc,
-                        'is_self': post.is_self,
-                        'selftext': post.selftext[:200] if post.is_self else None  # First 200 chars
-                    })
-            except Exception as e:
-                print(f"Error fetching posts from r/{subreddit_name}: {e}")
-                continue
+        try:
+            subreddit = self._thread_reddit().subreddit(subreddit_name)
+            
+            # Get top posts based on time filter
+            # 'hot' = trending now (combination of score and recency)
+            # 'top' = highest scoring posts in time period
+            # For "hottest", we use 'hot' which is what Reddit shows on the front page
+            # But if user wants time-filtered top posts, we can use 'top' with time_filter
+            if time_filter and time_filter != 'all':
+                # Use 'top' for time-filtered results (e.g., top posts today)
+                posts = subreddit.top(limit=limit, time_filter=time_filter)
+            else:
+                # Use 'hot' for current hottest/trending posts
+                posts = subreddit.hot(limit=limit)
+            
+            posts = [{
+                'title': post.title,
+                'score': post.score,
+                'subreddit': subreddit_name,
+                'url': post.url,
+                'permalink': f"https://reddit.com{post.permalink}",
+                'author': str(post.author),
+                'num_comments': post.num_comments,
+                'created_utc': post.created_utc,
+                'is_self': post.is_self,
+                'selftext': post.selftext[:200] if post.is_self else None  # First 200 chars
+            } for post in posts]
+        except Exception as e:
+            print(f"Error fetching posts from r/{subreddit_name}: {e}")
+            return []
         
-        # Sort by score (upvotes) descending and return top N
-        all_posts.sort(key=lambda x: x['score'], reverse=True)
-        return all_posts[:total_limit]
+        now = time.monotonic()
+        with self._posts_cache_lock:
+            # Drop expired listings so names no longer asked for don't accumulate
+            for old_key in [k for k, (fetched, _) in self._posts_cache.items()
+                            if now - fetched >= REDDIT_CACHE_TTL_SECONDS]:
+                del self._posts_cache[old_key]
+            self._posts_cache[cache_key] = (now, posts)
+        return [dict(post) for post in posts]
     
     def get_top_posts_from_my_subreddits(self, time_filter: str = 'day',
                                          limit_per_subreddit: int = 5,
@@ -7,10 +7,7 @@ let displayedNewsCount = 10;
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', function() {
     loadLLMProviders();
-    loadCalendar();
-    loadEmails();
-    loadNews('general');
-    loadReddit();
+    loadDashboard();
     
     // Chat input handler
     const chatInput = document.getElementById('chat-input');
@@ -138,11 +135,19 @@ async function sendMessage() {
     addChatMessage('user', message);
     input.value = '';
     
-    // Show loading
-    const loadingId = addChatMessage('assistant', 'Thinking...');
+    // Show loading, then fill the same message in as the response streams
+    const messageId = addChatMessage('assistant', 'Thinking...');
+    const messageEl = document.getElementById(messageId);
+    const messagesContainer = document.getElementById('chat-messages');
+    let text = '';
+    
+    const showText = (value) => {
+        messageEl.textContent = value;
+        messagesContainer.scrollTop = messagesContainer.scrollHeight;
+    };
     
     try {
-        const response = await fetch('/api/chat', {
+        const response = await fetch('/api/chat/stream', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -150,18 +155,45 @@ async function sendMessage() {
             body: JSON.stringify({ message: message })
         });
         
-        const data = await response.json();
+        if (!response.ok) {
+            const data = await response.json();
+            showText(data.error || 'No response');
+            return;
+        }
         
-        // Remove loading message
-        const loadingEl = document.getElementById(loadingId);
-        if (loadingEl) loadingEl.remove();
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            
+            // Server-Sent Events are separated by a blank line
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
+            
+            for (const raw of events) {
+                if (!raw.startsWith('data: ')) continue;
+                const event = JSON.parse(raw.slice(6));
+                
+                if (event.type === 'text') {
+                    text += event.text;
+                    showText(text);
+                } else if (event.type === 'tool') {
+                    if (text && !text.endsWith('\n\n')) text += '\n\n';
+                    if (!text) showText('Working...');
+                } else if (event.type === 'error') {
+                    text += (text ? '\n\n' : '') + 'Error: ' + event.error;
+                    showText(text);
+                }
+            }
+        }
         
-        // Add response
-        addChatMessage('assistant', data.response || data.error || 'No response');
+        if (!text) showText('No response');
     } catch (error) {
-        const loadingEl = document.getElementById(loadingId);
-        if (loadingEl) loadingEl.remove();
-        addChatMessage('assistant', 'Error: ' + error.message);
+        showText('Error: ' + error.message);
     }
 }
 
@@ -177,102 +209,133 @@ function addChatMessage(role, text) {
     return messageId;
 }
 
-// Calendar
-async function loadCalendar() {
-    const loading = document.getElementById('calendar-loading');
-    const container = document.getElementById('calendar-events');
+// Dashboard - fetch all panels in a single request
+async function loadDashboard() {
+    setActiveNewsTopic('general');
     
     try {
-        const response = await fetch('/api/calendar/upcoming');
+        const response = await fetch('/api/dashboard?topic=general&news_limit=15&reddit_limit=5');
         const data = await response.json();
         
-        loading.style.display = 'none';
-        
         if (data.error) {
-            container.innerHTML = `<p style="color: red;">Error: ${data.error}</p>`;
-            return;
+            throw new Error(data.error);
         }
         
-        if (data.events.length === 0) {
-            container.innerHTML = '<p>No upcoming events</p>';
-            return;
-        }
-        
-        // Render exactly up to 10 events, pad to 10 slots for 5x2 grid
-        const eventsToShow = data.events.slice(0, 10);
-        const emptySlots = 10 - eventsToShow.length;
-        
-        let html = eventsToShow.map(event => `
-            <div class="tile calendar-tile ${event.is_priority ? 'priority' : ''}">
-                <div class="tile-title">${escapeHtml(event.title)}</div>
-                <div class="calendar-time">${event.start_display}</div>
-                ${event.location ? `<div class="tile-content" style="-webkit-line-clamp: 2;">📍 ${escapeHtml(event.location)}</div>` : ''}
-                ${event.htmlLink ? `<a href="${event.htmlLink}" target="_blank" class="tile-link">Open →</a>` : ''}
-            </div>
-        `).join('');
-        
-        // Add empty slots to maintain 5x2 grid layout
-        for (let i = 0; i < emptySlots; i++) {
-            html += '<div class="tile calendar-tile empty-slot"></div>';
-        }
-        
-        container.innerHTML = html;
+        renderCalendar(data.calendar);
+        renderEmails(data.emails);
+        renderNews(data.news);
+        renderReddit(data.reddit);
     } catch (error) {
-        loading.style.display = 'none';
-        container.innerHTML = `<p style="color: red;">Error loading calendar: ${error.message}</p>`;
+        // Fall back to loading each panel separately
+        loadCalendar();
+        loadEmails();
+        loadNews('general');
+        loadReddit();
+    }
+}
+
+// Calendar
+async function loadCalendar() {
+    try {
+        const response = await fetch('/api/calendar/upcoming');
+        const data = await response.json();
+        renderCalendar(data);
+    } catch (error) {
+        document.getElementById('calendar-loading').style.display = 'none';
+        document.getElementById('calendar-events').innerHTML = `<p style="color: red;">Error loading calendar: ${error.message}</p>`;
+    }
+}
+
+function renderCalendar(data) {
+    const loading = document.getElementById('calendar-loading');
+    const container = document.getElementById('calendar-events');
+    
+    loading.style.display = 'none';
+    
+    if (data.error) {
+        container.innerHTML = `<p style="color: red;">Error: ${data.error}</p>`;
+        return;
+    }
+    
+    if (data.events.length === 0) {
+        container.innerHTML = '<p>No upcoming events</p>';
+        return;
+    }
+    
+    // Render exactly up to 10 events, pad to 10 slots for 5x2 grid
+    const eventsToShow = data.events.slice(0, 10);
+    const emptySlots = 10 - eventsToShow.length;
+    
+    let html = eventsToShow.map(event => `
+        <div class="tile calendar-tile ${event.is_priority ? 'priority' : ''}">
+            <div class="tile-title">${escapeHtml(event.title)}</div>
+            <div class="calendar-time">${event.start_display}</div>
+            ${event.location ? `<div class="tile-content" style="-webkit-line-clamp: 2;">📍 ${escapeHtml(event.location)}</div>` : ''}
+            ${event.htmlLink ? `<a href="${event.htmlLink}" target="_blank" class="tile-link">Open →</a>` : ''}
+        </div>
+    `).join('');
+    
+    // Add empty slots to maintain 5x2 grid layout
+    for (let i = 0; i < emptySlots; i++) {
+        html += '<div class="tile calendar-tile empty-slot"></div>';
     }
+    
+    container.innerHTML = html;
 }
 
 // Emails
 async function loadEmails() {
-    const loading = document.getElementById('email-loading');
-    const container = document.getElementById('email-list');
-    
     try {
         const response = await fetch('/api/emails/recent');
         const data = await response.json();
-        
-        loading.style.display = 'none';
-        
-        if (data.error) {
-            container.innerHTML = `<p style="color: red;">Error: ${data.error}</p>`;
-            return;
-        }
-        
-        // Filter out dismissed emails and maintain sorting (response-required first)
-        const filteredEmails = data.emails
-            .filter(email => !dismissedEmails.includes(email.id))
-            .sort((a, b) => {
-                // Sort: response-required emails first
-                if (a.requires_response && !b.requires_response) return -1;
-                if (!a.requires_response && b.requires_response) return 1;
-                return 0;
-            });
-        
-        if (filteredEmails.length === 0) {
-            container.innerHTML = '<p>No new emails</p>';
-            return;
-        }
-        
-        container.innerHTML = filteredEmails.map(email => `
-            <div class="email-item ${email.requires_response ? 'response-required' : ''}" data-email-id="${email.id}">
-                <button class="dismiss-btn" onclick="dismissEmail('${email.id}')" title="Dismiss">×</button>
-                ${email.requires_response ? '<div class="response-badge">⚠️ Response Requested</div>' : ''}
-                <div class="email-header">
-                    <div class="email-from">${escapeHtml(email.from)}</div>
-                    <div class="email-date">${email.date}</div>
-                </div>
-                <div class="email-subject">${escapeHtml(email.subject)}</div>
-                <div class="email-snippet">${escapeHtml(email.snippet || 'No preview available')}</div>
-                <a href="${email.gmail_link}" target="_blank" class="email-link">Open in Gmail →</a>
-            </div>
-        `).join('');
+        renderEmails(data);
     } catch (error) {
-        loading.style.display = 'none';
-        container.innerHTML = `<p style="color: red;">Error loading emails: ${error.message}</p>`;
+        document.getElementById('email-loading').style.display = 'none';
+        document.getElementById('email-list').innerHTML = `<p style="color: red;">Error loading emails: ${error.message}</p>`;
     }
 }
 
+function renderEmails(data) {
+    const loading = document.getElementById('email-loading');
+    const container = document.getElementById('email-list');
+    
+    loading.style.display = 'none';
+    
+    if (data.error) {
+        container.innerHTML = `<p style="color: red;">Error: ${data.error}</p>`;
+        return;
+    }
+    
+    // Filter out dismissed emails and maintain sorting (response-required first)
+    const filteredEmails = data.emails
+        .filter(email => !dismissedEmails.includes(email.id))
+        .sort((a, b) => {
+            // Sort: response-required emails first
+            if (a.requires_response && !b.requires_response) return -1;
+            if (!a.requires_response && b.requires_response) return 1;
+            return 0;
+        });
+    
+    if (filteredEmails.length === 0) {
+        container.innerHTML = '<p>No new emails</p>';
+        return;
+    }
+    
+    container.innerHTML = filteredEmails.map(email => `
+        <div class="email-item ${email.requires_response ? 'response-required' : ''}" data-email-id="${email.id}">
+            <button class="dismiss-btn" onclick="dismissEmail('${email.id}')" title="Dismiss">×</button>
+            ${email.requires_response ? '<div class="response-badge">⚠️ Response Requested</div>' : ''}
+            <div class="email-header">
+                <div class="email-from">${escapeHtml(email.from)}</div>
+                <div class="email-date">${email.date}</div>
+            </div>
+            <div class="email-subject">${escapeHtml(email.subject)}</div>
+            <div class="email-snippet">${escapeHtml(email.snippet || 'No preview available')}</div>
+            <a href="${email.gmail_link}" target="_blank" class="email-link">Open in Gmail →</a>
+        </div>
+    `).join('');
+}
+
 function dismissEmail(emailId) {
     // Add to dismissed list
     if (!dismissedEmails.includes(emailId)) {
@@ -304,10 +367,7 @@ function clearDismissedEmails() {
 }
 
 // News
-async function loadNews(topic) {
-    const loading = document.getElementById('news-loading');
-    const container = document.getElementById('news-articles');
-    
+function setActiveNewsTopic(topic) {
     currentNewsTopic = topic;
     displayedNewsCount = 10;
     
@@ -318,6 +378,13 @@ async function loadNews(topic) {
             btn.classList.add('active');
         }
     });
+}
+
+async function loadNews(topic) {
+    const loading = document.getElementById('news-loading');
+    const container = document.getElementById('news-articles');
+    
+    setActiveNewsTopic(topic);
     
     loading.style.display = 'block';
     container.innerHTML = '';
@@ -326,30 +393,36 @@ async function loadNews(topic) {
         // Fetch more articles than needed for the queue
         const response = await fetch(`/api/news?topic=${topic}&limit=15`);
         const data = await response.json();
-        
-        loading.style.display = 'none';
-        
-        if (data.error) {
-            container.innerHTML = `<p style="color: red;">Error: ${data.error}</p>`;
-            return;
-        }
-        
-        if (data.articles.length === 0) {
-            container.innerHTML = '<p>No articles found</p>';
-            return;
-        }
-        
-        // Store all articles in queue
-        newsQueue = data.articles;
-        
-        // Display first 5
-        renderNewsArticles();
+        renderNews(data);
     } catch (error) {
         loading.style.display = 'none';
         container.innerHTML = `<p style="color: red;">Error loading news: ${error.message}</p>`;
     }
 }
 
+function renderNews(data) {
+    const loading = document.getElementById('news-loading');
+    const container = document.getElementById('news-articles');
+    
+    loading.style.display = 'none';
+    
+    if (data.error) {
+        container.innerHTML = `<p style="color: red;">Error: ${data.error}</p>`;
+        return;
+    }
+    
+    if (data.articles.length === 0) {
+        container.innerHTML = '<p>No articles found</p>';
+        return;
+    }
+    
+    // Store all articles in queue
+    newsQueue = data.articles;
+    
+    // Display first 5
+    renderNewsArticles();
+}
+
 function renderNewsArticles() {
     const container = document.getElementById('news-articles');
     const articlesToShow = newsQueue.slice(0, displayedNewsCount);
@@ -398,42 +471,45 @@ function dismissNews(index) {
 
 // Reddit
 async function loadReddit() {
-    const loading = document.getElementById('reddit-loading');
-    const container = document.getElementById('reddit-posts');
-    
     try {
         const response = await fetch('/api/reddit?limit=5');
         const data = await response.json();
-        
-        loading.style.display = 'none';
-        
-        if (data.error) {
-            container.innerHTML = `<p style="color: red;">Error: ${data.error}</p>`;
-            return;
-        }
-        
-        if (data.posts.length === 0) {
-            container.innerHTML = '<p>No Reddit posts available</p>';
-            return;
-        }
-        
-        container.innerHTML = data.posts.map(post => `
-            <div class="tile reddit-tile">
-                <div class="tile-title">${escapeHtml(post.title)}</div>
-                <div class="reddit-meta">
-                    <span class="reddit-subreddit">r/${escapeHtml(post.subreddit)}</span>
-                    <span>👍 ${post.score}</span>
-                    <span>💬 ${post.num_comments}</span>
-                </div>
-                ${post.permalink ? `<a href="${post.permalink}" target="_blank" class="tile-link">View on Reddit →</a>` : ''}
-            </div>
-        `).join('');
+        renderReddit(data);
     } catch (error) {
-        loading.style.display = 'none';
-        container.innerHTML = `<p style="color: red;">Error loading Reddit: ${error.message}</p>`;
+        document.getElementById('reddit-loading').style.display = 'none';
+        document.getElementById('reddit-posts').innerHTML = `<p style="color: red;">Error loading Reddit: ${error.message}</p>`;
     }
 }
 
+function renderReddit(data) {
+    const loading = document.getElementById('reddit-loading');
+    const container = document.getElementById('reddit-posts');
+    
+    loading.style.display = 'none';
+    
+    if (data.error) {
+        container.innerHTML = `<p style="color: red;">Error: ${data.error}</p>`;
+        return;
+    }
+    
+    if (data.posts.length === 0) {
+        container.innerHTML = '<p>No Reddit posts available</p>';
+        return;
+    }
+    
+    container.innerHTML = data.posts.map(post => `
+        <div class="tile reddit-tile">
+            <div class="tile-title">${escapeHtml(post.title)}</div>
+            <div class="reddit-meta">
+                <span class="reddit-subreddit">r/${escapeHtml(post.subreddit)}</span>
+                <span>👍 ${post.score}</span>
+                <span>💬 ${post.num_comments}</span>
+            </div>
+            ${post.permalink ? `<a href="${post.permalink}" target="_blank" class="tile-link">View on Reddit →</a>` : ''}
+        </div>
+    `).join('');
+}
+
 // Exclusions Modal
 async function showExclusionsModal() {
     const modal = document.getElementById('exclusions-modal');
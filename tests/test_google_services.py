@@ -0,0 +1,52 @@
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+try:
+    import google_services
+    HAS_GOOGLE_SERVICES = True
+except ImportError:
+    HAS_GOOGLE_SERVICES = False
+
+
+def make_services(calendar):
+    """Build a GoogleServices around a fake calendar client, skipping OAuth."""
+    services = google_services.GoogleServices.__new__(google_services.GoogleServices)
+    services.tz = google_services.DEFAULT_TZ
+    services._cache = {}
+    services._cache_lock = threading.Lock()
+    services.calendar = calendar
+    return services
+
+
+@unittest.skipUnless(HAS_GOOGLE_SERVICES, "Google API client libraries not installed")
+class FreeBusyCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.calendar = mock.Mock()
+        self.calendar.freebusy.return_value.query.return_value.execute.return_value = {
+            'calendars': {'primary': {'busy': []}}
+        }
+        self.calendar.events.return_value.list.return_value.execute.return_value = {'items': []}
+        self.calendar.events.return_value.insert.return_value.execute.return_value = {'id': 'new'}
+        self.services = make_services(self.calendar)
+
+    def test_check_conflicts_after_find_free_slots(self):
+        self.services.find_free_slots(days_ahead=1)
+
+        start = datetime.now(self.services.tz) + timedelta(hours=1)
+        self.assertEqual(self.services.check_conflicts(start, start + timedelta(hours=1)), [])
+        self.calendar.events.return_value.list.assert_called_once()
+
+    def test_creating_an_event_drops_cached_free_busy(self):
+        self.services.find_free_slots(days_ahead=1)
+
+        start = datetime.now(self.services.tz) + timedelta(hours=1)
+        self.services.create_event('Meeting', start, start + timedelta(hours=1))
+        self.services.find_free_slots(days_ahead=1)
+
+        self.assertEqual(self.calendar.freebusy.return_value.query.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()